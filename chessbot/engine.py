@@ -1,95 +1,338 @@
-"""Minimax search with alpha-beta pruning, transposition table, and iterative deepening."""
+"""Minimax search with alpha-beta pruning, quiescence, transposition table, and iterative deepening."""
 
 from __future__ import annotations
 
 import math
 import time
+from typing import Iterator
 
 import chess
+import numpy as np
 
 from chessbot.evaluation import evaluate
 from chessbot.genome import Genome
+from chessbot.transposition import TranspositionTable
+from chessbot.zobrist import HashedBoard
 
 # Transposition table entry flags
 _EXACT = 0
 _LOWER = 1  # alpha cutoff (failed high)
 _UPPER = 2  # beta cutoff (failed low)
+_QS = 4  # set on quiescence entries so the main search never trusts them
+# Quiescence entries are stored under key ^ _QS_SALT, so a depth-0 capture
+# search never overwrites the main-search entry (and best move) of a position
+_QS_SALT = 0x9E3779B97F4A7C15
 
+# Maximum capture plies explored by quiescence search below a leaf
+_MAX_QUIESCE_DEPTH = 8
 
-def _order_moves(board: chess.Board) -> list[chess.Move]:
-    """Order moves: captures first, then quiet moves.
+# Aspiration windows: growth factor on fail-high/low, and re-searches
+# allowed per depth before falling back to a full window
+_ASPIRATION_WIDEN = 4
+_MAX_ASPIRATION_RESEARCHES = 3
 
-    Skips expensive check-detection (push/pop per move) to keep ordering fast.
+
+# Move-ordering score bands: captures (MVV-LVA) > killer moves > history
+_CAPTURE_SCORE = 1 << 30
+_KILLER_SCORE = 1 << 29
+
+
+def _pack_move(move: chess.Move) -> int:
+    """Pack a move into 16 bits: from | to << 6 | promotion << 12."""
+    return move.from_square | move.to_square << 6 | (move.promotion or 0) << 12
+
+
+def _unpack_move(packed: int) -> chess.Move:
+    """Inverse of :func:`_pack_move`."""
+    return chess.Move(packed & 63, packed >> 6 & 63, (packed >> 12) or None)
+
+
+def _order_key(
+    board: chess.Board,
+    move: chess.Move,
+    killers: np.ndarray | None,
+    history: np.ndarray | None,
+) -> int:
+    """Sort key for *move*: higher is searched first."""
+    victim = board.piece_type_at(move.to_square)
+    if victim is None and move.to_square == board.ep_square and board.pawns & chess.BB_SQUARES[move.from_square]:
+        victim = chess.PAWN  # en passant
+    if victim is not None:
+        # MVV-LVA: most valuable victim first, least valuable attacker breaks ties
+        return _CAPTURE_SCORE + victim * 8 - board.piece_type_at(move.from_square)
+    if killers is not None:
+        packed = _pack_move(move)
+        if packed == killers[0] or packed == killers[1]:
+            return _KILLER_SCORE
+    if history is not None:
+        return int(history[move.from_square, move.to_square])
+    return 0
+
+
+def _order_moves(
+    board: chess.Board,
+    killers: np.ndarray | None = None,
+    history: np.ndarray | None = None,
+) -> list[chess.Move]:
+    """Order moves: captures by MVV-LVA, then killer moves, then by history score.
+
+    *killers* is the pair of killer moves (packed) for the current depth and
+    *history* a 64x64 from/to table of quiet-move cutoff scores.  Skips
+    expensive check-detection (push/pop per move) to keep ordering fast.
     """
-    captures = []
-    quiet = []
+    moves = list(board.legal_moves)
+    moves.sort(key=lambda m: _order_key(board, m, killers, history), reverse=True)
+    return moves
 
-    for move in board.legal_moves:
-        if board.is_capture(move):
-            captures.append(move)
-        else:
-            quiet.append(move)
 
-    return captures + quiet
+def _iter_moves(
+    board: chess.Board,
+    tt_move: chess.Move | None,
+    killers: np.ndarray,
+    history: np.ndarray,
+) -> Iterator[chess.Move]:
+    """Yield the transposition-table move first (if legal), then the rest in order.
+
+    Ordering is deferred until the TT move has been searched, so a cutoff on
+    it skips move generation and sorting entirely.
+    """
+    if tt_move is not None and board.is_legal(tt_move):
+        yield tt_move
+        for move in _order_moves(board, killers, history):
+            if move != tt_move:
+                yield move
+    else:
+        yield from _order_moves(board, killers, history)
 
 
-def _minimax(
+def _record_cutoff(
     board: chess.Board,
+    move: chess.Move,
+    depth: int,
+    killers: np.ndarray,
+    history: np.ndarray,
+) -> None:
+    """Remember a quiet move that caused a beta cutoff."""
+    if board.is_capture(move):
+        return
+    packed = _pack_move(move)
+    if killers[depth, 0] != packed:
+        killers[depth, 1] = killers[depth, 0]
+        killers[depth, 0] = packed
+    history[move.from_square, move.to_square] += depth * depth
+
+
+def _quiesce(
+    board: HashedBoard,
+    genome: Genome,
+    alpha: float,
+    beta: float,
+    maximizing: bool,
+    tt: TranspositionTable,
+    depth: int = _MAX_QUIESCE_DEPTH,
+    has_moves: bool | None = None,
+) -> float:
+    """Capture-only search below the horizon so leaves are tactically quiet.
+
+    The static evaluation is a stand-pat bound for the side to move; only
+    captures (MVV-LVA ordered) are searched beyond it.  Entries go into *tt*
+    at depth 0 under the salted key ``zobrist ^ _QS_SALT``, tagged with
+    :data:`_QS`.
+    """
+    if has_moves is None:
+        has_moves = any(board.generate_legal_moves())
+    if not has_moves or depth == 0:
+        return evaluate(board, genome, has_moves)
+
+    # Probe before the static evaluation so a hit skips it entirely
+    key = board.zobrist ^ _QS_SALT
+    tt_entry = tt.probe(key)
+    if tt_entry is not None and tt_entry[1] & _QS:
+        tt_flag, tt_value = tt_entry[1] & ~_QS, tt_entry[2]
+        if tt_flag == _EXACT:
+            return tt_value
+        elif tt_flag == _LOWER and tt_value >= beta:
+            return tt_value
+        elif tt_flag == _UPPER and tt_value <= alpha:
+            return tt_value
+
+    stand_pat = evaluate(board, genome, has_moves)
+    orig_alpha = alpha
+    orig_beta = beta
+    value = stand_pat
+    best_move = None
+    if maximizing:
+        if value >= beta:
+            return value
+        alpha = max(alpha, value)
+    else:
+        if value <= alpha:
+            return value
+        beta = min(beta, value)
+
+    captures = list(board.generate_legal_captures())
+    captures.sort(key=lambda m: _order_key(board, m, None, None), reverse=True)
+    for move in captures:
+        board.push(move)
+        score = _quiesce(board, genome, alpha, beta, not maximizing, tt, depth - 1)
+        board.pop()
+        if maximizing:
+            if score > value:
+                value = score
+                best_move = move
+                alpha = max(alpha, value)
+        elif score < value:
+            value = score
+            best_move = move
+            beta = min(beta, value)
+        if alpha >= beta:
+            break
+
+    if value <= orig_alpha:
+        flag = _UPPER
+    elif value >= orig_beta:
+        flag = _LOWER
+    else:
+        flag = _EXACT
+    tt.store(key, 0, flag | _QS, value, _pack_move(best_move) if best_move is not None else 0)
+
+    return value
+
+
+def _minimax(
+    board: HashedBoard,
     genome: Genome,
     depth: int,
     alpha: float,
     beta: float,
     maximizing: bool,
-    tt: dict,
+    tt: TranspositionTable,
+    killers: np.ndarray,
+    history: np.ndarray,
 ) -> float:
-    """Alpha-beta minimax with transposition table. Returns evaluation score."""
-    if depth == 0 or board.is_game_over():
-        return evaluate(board, genome)
+    """Alpha-beta minimax with transposition table. Returns evaluation score.
+
+    *killers* (depth x 2, packed moves) and *history* (64 x 64) are int32
+    move-ordering tables shared across the whole search.
+    """
+    # Draw claims are handled at the root; here only mate/stalemate matter
+    has_moves = any(board.generate_legal_moves())
+    if not has_moves:
+        return evaluate(board, genome, has_moves)
+    if depth == 0:
+        return _quiesce(board, genome, alpha, beta, maximizing, tt, has_moves=has_moves)
 
-    key = board.fen()
-    tt_entry = tt.get(key)
+    key = board.zobrist
+    tt_move = None
+    tt_entry = tt.probe(key)
     if tt_entry is not None:
-        tt_depth, tt_flag, tt_value = tt_entry
-        if tt_depth >= depth:
+        tt_depth, tt_flag, tt_value, tt_packed = tt_entry
+        if tt_depth >= depth and not tt_flag & _QS:
             if tt_flag == _EXACT:
                 return tt_value
             elif tt_flag == _LOWER and tt_value >= beta:
                 return tt_value
             elif tt_flag == _UPPER and tt_value <= alpha:
                 return tt_value
+        if tt_packed:
+            tt_move = _unpack_move(tt_packed)
 
-    moves = _order_moves(board)
+    moves = _iter_moves(board, tt_move, killers[depth], history)
     orig_alpha = alpha
+    orig_beta = beta
+    best_move = None
+    push = board.push
+    pop = board.pop
 
     if maximizing:
         value = -math.inf
+        for move in moves:
+            push(move)
+            score = _minimax(board, genome, depth - 1, alpha, beta, False, tt, killers, history)
+            pop()
+            if score > value:
+                value = score
+                best_move = move
+                if value > alpha:
+                    alpha = value
+                    if alpha >= beta:
+                        _record_cutoff(board, move, depth, killers, history)
+                        break
+    else:
+        value = math.inf
+        for move in moves:
+            push(move)
+            score = _minimax(board, genome, depth - 1, alpha, beta, True, tt, killers, history)
+            pop()
+            if score < value:
+                value = score
+                best_move = move
+                if value < beta:
+                    beta = value
+                    if alpha >= beta:
+                        _record_cutoff(board, move, depth, killers, history)
+                        break
+
+    # Store in transposition table (bounds relative to the original window)
+    if value <= orig_alpha:
+        flag = _UPPER
+    elif value >= orig_beta:
+        flag = _LOWER
+    else:
+        flag = _EXACT
+    tt.store(key, depth, flag, value, _pack_move(best_move) if best_move is not None else 0)
+
+    return value
+
+
+def _search_root(
+    board: HashedBoard,
+    genome: Genome,
+    moves: list[chess.Move],
+    depth: int,
+    alpha: float,
+    beta: float,
+    maximizing: bool,
+    tt: TranspositionTable,
+    killers: np.ndarray,
+    history: np.ndarray,
+    deadline: float | None,
+) -> tuple[float, chess.Move]:
+    """Search every root move inside the (alpha, beta) window.
+
+    Returns (best_value, best_move).  A value <= alpha or >= beta means the
+    search failed low/high and the value is only a bound.
+    """
+    best_move = moves[0]
+    if maximizing:
+        best_value = -math.inf
         for move in moves:
             board.push(move)
-            value = max(value, _minimax(board, genome, depth - 1, alpha, beta, False, tt))
+            value = _minimax(board, genome, depth - 1, alpha, beta, False, tt, killers, history)
             board.pop()
+            if value > best_value:
+                best_value = value
+                best_move = move
             alpha = max(alpha, value)
             if alpha >= beta:
                 break
+            if deadline and time.perf_counter() >= deadline:
+                break
     else:
-        value = math.inf
+        best_value = math.inf
         for move in moves:
             board.push(move)
-            value = min(value, _minimax(board, genome, depth - 1, alpha, beta, True, tt))
+            value = _minimax(board, genome, depth - 1, alpha, beta, True, tt, killers, history)
             board.pop()
+            if value < best_value:
+                best_value = value
+                best_move = move
             beta = min(beta, value)
             if alpha >= beta:
                 break
-
-    # Store in transposition table
-    if value <= orig_alpha:
-        flag = _UPPER
-    elif value >= beta:
-        flag = _LOWER
-    else:
-        flag = _EXACT
-    tt[key] = (depth, flag, value)
-
-    return value
+            if deadline and time.perf_counter() >= deadline:
+                break
+    return best_value, best_move
 
 
 def search(
@@ -97,7 +340,7 @@ def search(
     genome: Genome,
     depth: int = 3,
     time_limit: float | None = None,
-    tt: dict | None = None,
+    tt: TranspositionTable | None = None,
 ) -> chess.Move | None:
     """Find the best move using iterative deepening with alpha-beta search.
 
@@ -105,54 +348,69 @@ def search(
     *depth* plies.  If *time_limit* (seconds) is given, the search stops
     early when the budget is exhausted and returns the best move found so far.
 
-    An external *tt* dict can be passed to share the table across moves
-    within a single game, giving further speedup.
+    An external *tt* table can be passed to share it across moves
+    within a single game, giving further speedup.  Entries are keyed by
+    Zobrist hash; a plain ``chess.Board`` is copied into a
+    :class:`~chessbot.zobrist.HashedBoard` first.
 
     Returns None if no legal moves exist.
     """
     if board.is_game_over():
         return None
 
+    if not isinstance(board, HashedBoard):
+        board = HashedBoard.from_board(board)
+
     moves = _order_moves(board)
     if not moves:
         return None
 
     if tt is None:
-        tt = {}
+        tt = TranspositionTable(size_mb=1.0)
 
     maximizing = board.turn == chess.WHITE
     best_move = moves[0]
+    killers = np.zeros((depth + 1, 2), dtype=np.int32)
+    history = np.zeros((64, 64), dtype=np.int32)
     deadline = (time.perf_counter() + time_limit) if time_limit else None
 
+    # Aspiration window half-width: one pawn in evaluation units
+    window = abs(genome.pawn_value * genome.w_material)
+    prev_score: float | None = None
+
     # Iterative deepening: search depth 1, 2, … up to *depth*
     for current_depth in range(1, depth + 1):
         if deadline and time.perf_counter() >= deadline:
             break
 
-        current_best = moves[0]
-        if maximizing:
-            best_value = -math.inf
-            for move in moves:
-                board.push(move)
-                value = _minimax(board, genome, current_depth - 1, -math.inf, math.inf, False, tt)
-                board.pop()
-                if value > best_value:
-                    best_value = value
-                    current_best = move
-                if deadline and time.perf_counter() >= deadline:
-                    break
+        if prev_score is None or window == 0:
+            value, current_best = _search_root(
+                board, genome, moves, current_depth, -math.inf, math.inf, maximizing, tt,
+                killers, history, deadline,
+            )
         else:
-            best_value = math.inf
-            for move in moves:
-                board.push(move)
-                value = _minimax(board, genome, current_depth - 1, -math.inf, math.inf, True, tt)
-                board.pop()
-                if value < best_value:
-                    best_value = value
-                    current_best = move
+            # Centre the window on the previous iteration's score and widen
+            # the failing side on fail-low/high; fall back to a full window.
+            below = above = window
+            for attempt in range(_MAX_ASPIRATION_RESEARCHES + 1):
+                if attempt < _MAX_ASPIRATION_RESEARCHES:
+                    alpha, beta = prev_score - below, prev_score + above
+                else:
+                    alpha, beta = -math.inf, math.inf
+                value, current_best = _search_root(
+                    board, genome, moves, current_depth, alpha, beta, maximizing, tt,
+                    killers, history, deadline,
+                )
                 if deadline and time.perf_counter() >= deadline:
                     break
+                if value <= alpha:
+                    below *= _ASPIRATION_WIDEN
+                elif value >= beta:
+                    above *= _ASPIRATION_WIDEN
+                else:
+                    break
 
+        prev_score = value
         best_move = current_best
 
     return best_move
@@ -2,40 +2,168 @@
 
 from __future__ import annotations
 
+from collections import OrderedDict
+
 import chess
+from chess import popcount
 
 from chessbot.genome import Genome
 
 # Center squares
 CENTER_SQUARES = [chess.E4, chess.D4, chess.E5, chess.D5]
 
+# Static-evaluation cache keyed by (Zobrist hash, genome weights), FIFO-bounded.
+# Keying on the weights rather than the genome object keeps entries valid
+# across searches, so a game's positions are scored once per player.
+# Only used for boards that carry a ``zobrist`` attribute (HashedBoard).
+EVAL_CACHE_SIZE = 1 << 18
+_eval_cache: OrderedDict[tuple[int, tuple[float, ...]], float] = OrderedDict()
 
-def eval_material(board: chess.Board, genome: Genome) -> float:
-    """Sum of piece values (white - black)."""
+
+def clear_eval_cache() -> None:
+    """Drop all cached evaluations."""
+    _eval_cache.clear()
+
+
+# ---- precomputed bitboard masks ----
+# Squares within Chebyshev distance 2 of each square
+KING_RING2: list[int] = [
+    sum(
+        chess.BB_SQUARES[other] for other in chess.SQUARES
+        if chess.square_distance(sq, other) <= 2
+    )
+    for sq in chess.SQUARES
+]
+
+
+def _shelter_mask(sq: int, direction: int) -> int:
+    bb = 0
+    for df in (-1, 0, 1):
+        f = chess.square_file(sq) + df
+        for dr in (1, 2):
+            r = chess.square_rank(sq) + direction * dr
+            if 0 <= f <= 7 and 0 <= r <= 7:
+                bb |= chess.BB_SQUARES[chess.square(f, r)]
+    return bb
+
+
+# Pawn-shelter squares: 1-2 ranks in front of the king, within one file
+SHELTER_W: list[int] = [_shelter_mask(sq, 1) for sq in chess.SQUARES]
+SHELTER_B: list[int] = [_shelter_mask(sq, -1) for sq in chess.SQUARES]
+
+_NOT_FILE_A = chess.BB_ALL & ~chess.BB_FILE_A
+_NOT_FILE_H = chess.BB_ALL & ~chess.BB_FILE_H
+# Ranks whose index has bit 0, 1 or 2 set: popcounts against these sum pawn ranks
+_RANK_BIT_MASKS = [
+    sum(chess.BB_RANKS[r] for r in range(8) if r >> bit & 1) for bit in range(3)
+]
+
+
+# ---- bitboard kernels ----
+# The numeric core of the bitboard-expressible terms works on plain ints
+# (Python's arbitrary-precision ints are the uint64s here) so evaluate()
+# can read the board once and hand the same bitboards to every kernel.
+# Mobility and center control need move/attack generation and stay
+# board-based.
+
+
+def _piece_bitboards(board: chess.BaseBoard) -> tuple[int, int, int, int, int, int, int, int]:
+    """(white, black, pawns, knights, bishops, rooks, queens, kings) bitboards."""
+    return (
+        board.occupied_co[chess.WHITE], board.occupied_co[chess.BLACK],
+        board.pawns, board.knights, board.bishops, board.rooks, board.queens, board.kings,
+    )
+
+
+def _material_kernel(
+    white: int, black: int, pawns: int, knights: int, bishops: int, rooks: int, queens: int, kings: int,
+    w: tuple[float, ...],
+) -> float:
+    """White-minus-black piece counts weighted by the genome's piece values ``w[0:5]``."""
+    return (
+        w[0] * (popcount(pawns & white) - popcount(pawns & black))
+        + w[1] * (popcount(knights & white) - popcount(knights & black))
+        + w[2] * (popcount(bishops & white) - popcount(bishops & black))
+        + w[3] * (popcount(rooks & white) - popcount(rooks & black))
+        + w[4] * (popcount(queens & white) - popcount(queens & black))
+    )
+
+
+def _king_safety_kernel(
+    white: int, black: int, pawns: int, knights: int, bishops: int, rooks: int, queens: int, kings: int,
+) -> float:
     score = 0.0
-    pv = genome.piece_values
-    for piece_type in pv:
-        score += len(board.pieces(piece_type, chess.WHITE)) * pv[piece_type]
-        score -= len(board.pieces(piece_type, chess.BLACK)) * pv[piece_type]
+    minor_major = knights | bishops | rooks | queens
+
+    king_bb = kings & white
+    if king_bb:
+        king_sq = king_bb.bit_length() - 1
+        score += popcount(SHELTER_W[king_sq] & pawns & white) * 0.3
+        score -= popcount(KING_RING2[king_sq] & black & minor_major) * 0.2
+
+    king_bb = kings & black
+    if king_bb:
+        king_sq = king_bb.bit_length() - 1
+        score -= popcount(SHELTER_B[king_sq] & pawns & black) * 0.3
+        score += popcount(KING_RING2[king_sq] & white & minor_major) * 0.2
+
     return score
 
 
-def eval_mobility(board: chess.Board) -> float:
-    """Difference in legal move counts (white - black)."""
-    # Count moves for the side to move
-    current_moves = board.legal_moves.count()
+def _pawn_structure_kernel(
+    white: int, black: int, pawns: int, knights: int, bishops: int, rooks: int, queens: int, kings: int,
+) -> float:
+    white_pawns = pawns & white
+    black_pawns = pawns & black
+    return (
+        _pawn_terms(white_pawns, black_pawns, True)
+        - _pawn_terms(black_pawns, white_pawns, False)
+    )
+
+
+def eval_material(board: chess.Board, genome: Genome) -> float:
+    """Sum of piece values (white - black)."""
+    return _material_kernel(*_piece_bitboards(board), genome._w)
+
+
+def _pinned(board: chess.Board, color: chess.Color, king: int) -> int:
+    """*color*'s pieces pinned to its king on *king*, whoever is to move."""
+    rooks_and_queens = board.rooks | board.queens
+    bishops_and_queens = board.bishops | board.queens
+    snipers = (
+        (chess.BB_RANK_ATTACKS[king][0] & rooks_and_queens)
+        | (chess.BB_FILE_ATTACKS[king][0] & rooks_and_queens)
+        | (chess.BB_DIAG_ATTACKS[king][0] & bishops_and_queens)
+    ) & board.occupied_co[not color]
+    pinned = 0
+    for sniper in chess.scan_reversed(snipers):
+        between = chess.between(king, sniper) & board.occupied
+        # Exactly one piece in between, and it is ours
+        if between and between & (between - 1) == 0:
+            pinned |= between
+    return pinned & board.occupied_co[color]
+
+
+def _side_mobility(board: chess.Board, color: chess.Color) -> int:
+    """Squares attacked by *color*'s pieces, excluding own-occupied ones.
+
+    Absolutely pinned pieces only count squares along their pin ray.
+    """
+    own = board.occupied_co[color]
+    king = board.king(color)
+    pinned = _pinned(board, color, king) if king is not None else 0
+    total = 0
+    for square in chess.scan_reversed(own):
+        mask = board.attacks_mask(square) & ~own
+        if pinned & chess.BB_SQUARES[square]:
+            mask &= board.pin_mask(color, square)
+        total += popcount(mask)
+    return total
 
-    # Switch perspective
-    board.push(chess.Move.null())
-    try:
-        opponent_moves = board.legal_moves.count()
-    finally:
-        board.pop()
 
-    if board.turn == chess.WHITE:
-        return float(current_moves - opponent_moves)
-    else:
-        return float(opponent_moves - current_moves)
+def eval_mobility(board: chess.Board) -> float:
+    """Difference in pseudo-legal attack counts (white - black)."""
+    return float(_side_mobility(board, chess.WHITE) - _side_mobility(board, chess.BLACK))
 
 
 def eval_center_control(board: chess.Board) -> float:
@@ -52,111 +180,119 @@ def eval_center_control(board: chess.Board) -> float:
 
 def eval_king_safety(board: chess.Board) -> float:
     """Pawn shelter bonus minus enemy piece proximity penalty."""
-    score = 0.0
-    for color in [chess.WHITE, chess.BLACK]:
-        sign = 1.0 if color == chess.WHITE else -1.0
-        king_sq = board.king(color)
-        if king_sq is None:
-            continue
-        king_file = chess.square_file(king_sq)
-        king_rank = chess.square_rank(king_sq)
-
-        # Pawn shelter: count friendly pawns within 1 file and 1-2 ranks ahead
-        shelter = 0
-        direction = 1 if color == chess.WHITE else -1
-        for df in [-1, 0, 1]:
-            f = king_file + df
-            if f < 0 or f > 7:
-                continue
-            for dr in [1, 2]:
-                r = king_rank + direction * dr
-                if 0 <= r <= 7:
-                    sq = chess.square(f, r)
-                    piece = board.piece_at(sq)
-                    if piece and piece.piece_type == chess.PAWN and piece.color == color:
-                        shelter += 1
-        score += sign * shelter * 0.3
-
-        # Enemy proximity penalty: iterate only enemy non-pawn pieces
-        enemy = not color
-        penalty = 0
-        for pt in [chess.KNIGHT, chess.BISHOP, chess.ROOK, chess.QUEEN]:
-            for sq in board.pieces(pt, enemy):
-                dist = max(abs(chess.square_file(sq) - king_file),
-                           abs(chess.square_rank(sq) - king_rank))
-                if dist <= 2:
-                    penalty += 1
-        score -= sign * penalty * 0.2
+    return _king_safety_kernel(*_piece_bitboards(board))
 
-    return score
+
+def _file_fill(bb: int) -> int:
+    """Smear every set bit over its whole file."""
+    bb |= bb << 8
+    bb |= bb << 16
+    bb |= bb << 32
+    bb &= chess.BB_ALL
+    bb |= bb >> 8
+    bb |= bb >> 16
+    bb |= bb >> 32
+    return bb
+
+
+def _north_span(bb: int) -> int:
+    """Squares strictly above every set bit, on the same file."""
+    bb = (bb << 8) & chess.BB_ALL
+    bb |= (bb << 8) & chess.BB_ALL
+    bb |= (bb << 16) & chess.BB_ALL
+    bb |= (bb << 32) & chess.BB_ALL
+    return bb
+
+
+def _south_span(bb: int) -> int:
+    """Squares strictly below every set bit, on the same file."""
+    bb >>= 8
+    bb |= bb >> 8
+    bb |= bb >> 16
+    bb |= bb >> 32
+    return bb
+
+
+def _pawn_terms(pawns: int, enemy_pawns: int, white: bool) -> float:
+    """Pawn-structure score for one side, from that side's point of view."""
+    # Doubled: every pawn with another friendly pawn ahead of or behind it
+    doubled = popcount(pawns & (_north_span(pawns) | _south_span(pawns)))
+
+    # Isolated: no friendly pawn on adjacent files
+    files = _file_fill(pawns)
+    neighbours = ((files << 1) & _NOT_FILE_A) | ((files >> 1) & _NOT_FILE_H)
+    isolated = popcount(pawns & ~neighbours)
+
+    # Passed: outside every enemy pawn's front span (its file and the adjacent
+    # ones, towards our side); bonus grows with advancement
+    span = _south_span(enemy_pawns) if white else _north_span(enemy_pawns)
+    blocked = span | ((span << 1) & _NOT_FILE_A) | ((span >> 1) & _NOT_FILE_H)
+    passed = pawns & ~blocked
+    rank_sum = (
+        popcount(passed & _RANK_BIT_MASKS[0])
+        + 2 * popcount(passed & _RANK_BIT_MASKS[1])
+        + 4 * popcount(passed & _RANK_BIT_MASKS[2])
+    )
+    advancement = rank_sum if white else 7 * popcount(passed) - rank_sum
+
+    # Connected: friendly pawn on an adjacent file and the same rank
+    connected = popcount(pawns & (((pawns << 1) & _NOT_FILE_A) | ((pawns >> 1) & _NOT_FILE_H)))
+
+    return -0.2 * doubled - 0.15 * isolated + 0.1 * advancement + 0.1 * connected
 
 
 def eval_pawn_structure(board: chess.Board) -> float:
     """Passed/connected bonuses, isolated/doubled penalties."""
-    score = 0.0
-    for color in [chess.WHITE, chess.BLACK]:
-        sign = 1.0 if color == chess.WHITE else -1.0
-        pawns = board.pieces(chess.PAWN, color)
-        pawn_squares = [(sq, chess.square_file(sq), chess.square_rank(sq)) for sq in pawns]
-        pawn_file_set = {f for _, f, _ in pawn_squares}
-        enemy_pawns = [(chess.square_file(ep), chess.square_rank(ep)) for ep in board.pieces(chess.PAWN, not color)]
-        direction = 1 if color == chess.WHITE else -1
-
-        for sq, f, r in pawn_squares:
-            # Doubled: another friendly pawn on same file
-            if sum(1 for _, pf, _ in pawn_squares if pf == f) > 1:
-                score -= sign * 0.2
-
-            # Isolated: no friendly pawn on adjacent files
-            if (f - 1) not in pawn_file_set and (f + 1) not in pawn_file_set:
-                score -= sign * 0.15
-
-            # Passed: no enemy pawn ahead on same or adjacent files
-            is_passed = True
-            for ef, er in enemy_pawns:
-                if abs(ef - f) <= 1:
-                    if direction == 1 and er > r:
-                        is_passed = False
-                        break
-                    if direction == -1 and er < r:
-                        is_passed = False
-                        break
-            if is_passed:
-                advancement = r if color == chess.WHITE else (7 - r)
-                score += sign * 0.1 * advancement
-
-            # Connected: friendly pawn on adjacent file and same rank
-            connected = any(
-                pf in (f - 1, f + 1) and pr == r
-                for _, pf, pr in pawn_squares if _ != sq
-            )
-            if connected:
-                score += sign * 0.1
-
-    return score
+    return _pawn_structure_kernel(*_piece_bitboards(board))
 
 
-def evaluate(board: chess.Board, genome: Genome) -> float:
+def evaluate(board: chess.Board, genome: Genome, has_moves: bool | None = None) -> float:
     """Full board evaluation combining all 5 sub-evaluators.
 
     Returns a score from white's perspective: positive = white advantage.
+
+    Search passes *has_moves* (whether the side to move has a legal move) so
+    mate/stalemate need no second move generation; draw claims (threefold,
+    50-move) are then left to the root and only insufficient material is checked.
     """
     # Terminal states
-    if board.is_checkmate():
-        return -10000.0 if board.turn == chess.WHITE else 10000.0
-    if board.is_stalemate() or board.is_insufficient_material() or board.can_claim_draw():
+    if has_moves is None:
+        if board.is_checkmate():
+            return -10000.0 if board.turn == chess.WHITE else 10000.0
+        if board.is_stalemate() or board.is_insufficient_material() or board.can_claim_draw():
+            return 0.0
+    elif not has_moves:
+        if board.is_check():
+            return -10000.0 if board.turn == chess.WHITE else 10000.0
+        return 0.0
+    elif board.is_insufficient_material():
         return 0.0
 
-    material = eval_material(board, genome)
+    w = genome._w
+    zobrist = getattr(board, "zobrist", None)
+    if zobrist is not None:
+        key = (zobrist, w)
+        cached = _eval_cache.get(key)
+        if cached is not None:
+            return cached
+
+    bb = _piece_bitboards(board)
+    material = _material_kernel(*bb, w)
     mobility = eval_mobility(board)
     center = eval_center_control(board)
-    king_safety = eval_king_safety(board)
-    pawn_struct = eval_pawn_structure(board)
+    king_safety = _king_safety_kernel(*bb)
+    pawn_struct = _pawn_structure_kernel(*bb)
 
-    return (
-        genome.w_material * material
-        + genome.w_mobility * mobility
-        + genome.w_center * center
-        + genome.w_king_safety * king_safety
-        + genome.w_pawn_structure * pawn_struct
+    score = (
+        w[5] * material
+        + w[6] * mobility
+        + w[7] * center
+        + w[8] * king_safety
+        + w[9] * pawn_struct
     )
+
+    if zobrist is not None:
+        _eval_cache[key] = score
+        if len(_eval_cache) > EVAL_CACHE_SIZE:
+            _eval_cache.popitem(last=False)
+    return score
@@ -2,28 +2,69 @@
 
 from __future__ import annotations
 
+import os
+from pathlib import Path
+
 import numpy as np
 
-from chessbot.genome import DEFAULT_GENES, NUM_GENES, Genome
+from chessbot.genome import DEFAULT_GENES, GENE_DTYPE, NUM_GENES, Genome, Population
+
+
+# Gene rows generated per block, so float64 scratch space stays bounded
+# however large the population (a file-backed one may not fit in RAM)
+_BLOCK_ROWS = 1 << 16
+
+
+def _new_genes(size: int, mmap_path: str | Path | None) -> np.ndarray:
+    """Uninitialized (size, NUM_GENES) gene matrix, file-backed if *mmap_path* is set.
+
+    A mapped matrix is written to a staging file next to *mmap_path* and
+    moved into place by :func:`_finish_genes`, so *mmap_path* may be the
+    file the parent population is still mapping.
+    """
+    if mmap_path is None:
+        return np.empty((size, NUM_GENES), dtype=GENE_DTYPE)
+    return np.memmap(f"{mmap_path}.tmp", dtype=GENE_DTYPE, mode="w+", shape=(size, NUM_GENES))
+
+
+def _finish_genes(genes: np.ndarray, mmap_path: str | Path | None) -> np.ndarray:
+    """Flush a matrix from :func:`_new_genes` and map it at *mmap_path*."""
+    if mmap_path is None:
+        return genes
+    genes.flush()
+    os.replace(genes.filename, mmap_path)
+    return np.memmap(mmap_path, dtype=GENE_DTYPE, mode="r+", shape=genes.shape)
 
 
 def initialize_population(
     size: int,
     rng: np.random.Generator | None = None,
     noise_scale: float = 0.3,
+    *,
+    mmap_path: str | Path | None = None,
 ) -> list[Genome]:
-    """Create a population of genomes with Gaussian noise around defaults."""
+    """Create a population of genomes with Gaussian noise around defaults.
+
+    With *mmap_path* the gene matrix is a ``np.memmap`` backed by that file,
+    so tournament workers map the same pages instead of receiving a pickled
+    copy of the population.
+    """
     if rng is None:
         rng = np.random.default_rng()
 
-    population = []
     default = np.array(DEFAULT_GENES, dtype=np.float64)
-    for _ in range(size):
-        genes = default + rng.normal(0, noise_scale, size=NUM_GENES) * default
+    genes = _new_genes(size, mmap_path)
+    for start in range(0, size, _BLOCK_ROWS):
+        # default + noise * default, built in place one block of rows at a time
+        block = rng.standard_normal((min(_BLOCK_ROWS, size - start), NUM_GENES))
+        block *= noise_scale
+        block *= default
+        block += default
         # Clamp material values to be positive
-        genes[:5] = np.maximum(genes[:5], 0.1)
-        population.append(Genome(genes=genes))
-    return population
+        np.maximum(block[:, :5], 0.1, out=block[:, :5])
+        genes[start:start + len(block)] = block
+    # Genomes are proxies onto the rows of one shared population
+    return Population(_finish_genes(genes, mmap_path)).genomes()
 
 
 def select_elite(
@@ -31,9 +72,20 @@ def select_elite(
     elite_fraction: float = 0.25,
 ) -> list[Genome]:
     """Select the top fraction of the population by fitness."""
-    n_elite = max(1, int(len(population) * elite_fraction))
-    sorted_pop = sorted(population, key=lambda g: g.fitness, reverse=True)
-    return [g.copy() for g in sorted_pop[:n_elite]]
+    pop = Population.from_genomes(population)
+    idx = _elite_indices(pop.fit, elite_fraction)
+    # Fancy indexing copies, so the elites get one fresh population of their own
+    return Population(pop.G[idx], pop.fit[idx]).genomes()
+
+
+def _elite_indices(fitness: np.ndarray, elite_fraction: float) -> np.ndarray:
+    """Indices of the top *elite_fraction* of *fitness*, best first."""
+    n_elite = min(max(1, int(len(fitness) * elite_fraction)), len(fitness))
+    if n_elite == 0:
+        return np.empty(0, dtype=np.intp)
+    # Partial top-k selection, then order just the k winners (best first)
+    top = np.sort(np.argpartition(-fitness, n_elite - 1)[:n_elite])
+    return top[np.argsort(-fitness[top], kind="stable")]
 
 
 def crossover(
@@ -45,9 +97,28 @@ def crossover(
     if rng is None:
         rng = np.random.default_rng()
 
-    mask = rng.random(NUM_GENES) < 0.5
-    child_genes = np.where(mask, parent_a.genes, parent_b.genes)
-    return Genome(genes=child_genes.copy())
+    parents = np.stack([parent_a.genes, parent_b.genes])
+    return Genome(genes=batched_crossover(parents, np.array([0]), np.array([1]), rng=rng)[0])
+
+
+def batched_crossover(
+    genes: np.ndarray,
+    parent_a: np.ndarray,
+    parent_b: np.ndarray,
+    rate: float = 0.5,
+    rng: np.random.Generator | None = None,
+) -> np.ndarray:
+    """Uniform crossover for a whole batch of children at once.
+
+    *genes* is the (n, NUM_GENES) population matrix and *parent_a* /
+    *parent_b* are index arrays of length m.  Each child gene comes from
+    parent A with probability *rate*.  Returns a new (m, NUM_GENES) array.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+
+    mask = rng.random((len(parent_a), genes.shape[1])) < rate
+    return np.where(mask, genes[parent_a], genes[parent_b])
 
 
 def mutate(
@@ -60,13 +131,31 @@ def mutate(
     if rng is None:
         rng = np.random.default_rng()
 
-    genes = genome.genes.copy()
-    for i in range(NUM_GENES):
-        if rng.random() < mutation_rate:
-            genes[i] += rng.normal(0, mutation_magnitude) * abs(genes[i])
-    # Clamp material values to be positive
-    genes[:5] = np.maximum(genes[:5], 0.1)
-    return Genome(genes=genes)
+    genes = genome.genes.copy()[None, :]
+    return Genome(genes=batched_mutate(genes, mutation_rate, mutation_magnitude, rng)[0])
+
+
+def batched_mutate(
+    genes: np.ndarray,
+    mutation_rate: float = 0.2,
+    mutation_magnitude: float = 0.1,
+    rng: np.random.Generator | None = None,
+) -> np.ndarray:
+    """Gaussian mutation of a whole (m, NUM_GENES) gene matrix, in place.
+
+    Each gene is perturbed with probability *mutation_rate* by noise
+    proportional to its own magnitude; material values are then clamped to
+    stay positive.  Returns *genes*.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+
+    mutated = rng.random(genes.shape) < mutation_rate
+    delta = rng.normal(0, mutation_magnitude, size=genes.shape)
+    delta *= np.abs(genes)
+    genes += mutated * delta
+    np.clip(genes[:, :5], 0.1, None, out=genes[:, :5])
+    return genes
 
 
 def next_generation(
@@ -75,25 +164,40 @@ def next_generation(
     mutation_rate: float = 0.2,
     mutation_magnitude: float = 0.1,
     rng: np.random.Generator | None = None,
+    *,
+    mmap_path: str | Path | None = None,
 ) -> list[Genome]:
-    """Produce next generation: elitism + crossover + mutation."""
+    """Produce next generation: elitism + crossover + mutation.
+
+    With *mmap_path* the new gene matrix is file-backed, as in
+    :func:`initialize_population`; it may be the current population's file.
+    """
     if rng is None:
         rng = np.random.default_rng()
 
     target_size = len(population)
-    elites = select_elite(population, elite_fraction)
-
-    new_pop = [e.copy() for e in elites]
-
-    # Fill the rest with offspring
-    while len(new_pop) < target_size:
+    pop = Population.from_genomes(population)
+    fitness, genes = pop.fit, pop.G
+    elite_idx = _elite_indices(fitness, elite_fraction)
+    n_elite = len(elite_idx)
+    n_children = target_size - n_elite
+
+    new_genes = _new_genes(target_size, mmap_path)
+    new_genes[:n_elite] = genes[elite_idx]
+    if n_children > 0:
         # Tournament selection for parents (pick 2 random, take the fitter)
-        idxs = rng.choice(len(population), size=4, replace=True)
-        parent_a = max(population[idxs[0]], population[idxs[1]], key=lambda g: g.fitness)
-        parent_b = max(population[idxs[2]], population[idxs[3]], key=lambda g: g.fitness)
-
-        child = crossover(parent_a, parent_b, rng)
-        child = mutate(child, mutation_rate, mutation_magnitude, rng)
-        new_pop.append(child)
-
-    return new_pop[:target_size]
+        idxs = rng.integers(0, len(population), size=(n_children, 4))
+        parent_a = np.where(fitness[idxs[:, 0]] >= fitness[idxs[:, 1]], idxs[:, 0], idxs[:, 1])
+        parent_b = np.where(fitness[idxs[:, 2]] >= fitness[idxs[:, 3]], idxs[:, 2], idxs[:, 3])
+
+        # Offspring are bred straight into the new matrix, a block of rows at a time
+        for start in range(0, n_children, _BLOCK_ROWS):
+            stop = min(start + _BLOCK_ROWS, n_children)
+            children = new_genes[n_elite + start:n_elite + stop]
+            children[:] = batched_crossover(genes, parent_a[start:stop], parent_b[start:stop], rng=rng)
+            batched_mutate(children, mutation_rate, mutation_magnitude, rng)
+
+    # Elites keep their fitness; children start from zero
+    new_fit = np.zeros(len(new_genes), dtype=np.float64)
+    new_fit[:n_elite] = fitness[elite_idx]
+    return Population(_finish_genes(new_genes, mmap_path), new_fit).genomes()
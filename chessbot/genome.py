@@ -8,7 +8,7 @@ A genome encodes 10 floating-point genes:
 from __future__ import annotations
 
 import json
-from dataclasses import dataclass, field
+from collections.abc import Iterable, Iterator
 
 import numpy as np
 
@@ -42,67 +42,108 @@ DEFAULT_GENES: list[float] = [
 
 NUM_GENES = len(DEFAULT_GENES)
 
+# Genes are stored in single precision: evaluation weights need nothing
+# finer, and half-size rows pack twice as many genomes per cache line.
+# Fitness stays float64 since it accumulates over many games.
+GENE_DTYPE = np.float32
+
 
-@dataclass
 class Genome:
-    """A single individual in the population."""
+    """A single individual in the population.
+
+    A genome is a row of a :class:`Population`: ``genes`` is a read-only
+    view of that population's gene row and ``fitness`` reads and writes its
+    fitness vector.  A genome built directly gets
+    a one-row population of its own wrapping the *genes* array (no copy
+    unless it has to be converted to :data:`GENE_DTYPE`).
+    """
+
+    __slots__ = ("_pop", "_idx", "piece_values", "_w")
+
+    def __init__(self, genes: np.ndarray | None = None, fitness: float = 0.0) -> None:
+        if genes is None:
+            genes = DEFAULT_GENES
+        genes = np.asarray(genes, dtype=GENE_DTYPE)
+        self._bind(Population(genes[None, :], np.array([fitness], dtype=np.float64)), 0)
+
+    @classmethod
+    def _view(cls, pop: Population, idx: int) -> Genome:
+        """Genome proxy for row *idx* of *pop*."""
+        genome = cls.__new__(cls)
+        genome._bind(pop, idx)
+        return genome
+
+    def _bind(self, pop: Population, idx: int) -> None:
+        self._pop = pop
+        self._idx = idx
+        genes = pop.G[idx]
+        # Genes are treated as immutable once the genome is built, so the
+        # weights can be cached in forms that are cheap to read per leaf.
+        # All 10 genes as plain Python floats (no NumPy scalar boxing)
+        self._w = tuple(genes.tolist())
+        # chess.PAWN..chess.QUEEN (1-5) → material value
+        self.piece_values: dict[int, float] = dict(zip(range(1, 6), self._w[:5]))
+
+    @property
+    def genes(self) -> np.ndarray:
+        # Read-only: the cached weight forms from _bind must stay in sync
+        genes = self._pop.G[self._idx]
+        genes.flags.writeable = False
+        return genes
+
+    @property
+    def fitness(self) -> float:
+        return float(self._pop.fit[self._idx])
+
+    @fitness.setter
+    def fitness(self, value: float) -> None:
+        self._pop.fit[self._idx] = value
 
-    genes: np.ndarray = field(default_factory=lambda: np.array(DEFAULT_GENES, dtype=np.float64))
-    fitness: float = 0.0
+    def __reduce__(self):
+        # Pickle as a standalone genome rather than dragging the population along
+        return (Genome, (self.genes, self.fitness))
 
     # ---- material piece values (indices 0-4) ----
     @property
     def pawn_value(self) -> float:
-        return float(self.genes[0])
+        return self._w[0]
 
     @property
     def knight_value(self) -> float:
-        return float(self.genes[1])
+        return self._w[1]
 
     @property
     def bishop_value(self) -> float:
-        return float(self.genes[2])
+        return self._w[2]
 
     @property
     def rook_value(self) -> float:
-        return float(self.genes[3])
+        return self._w[3]
 
     @property
     def queen_value(self) -> float:
-        return float(self.genes[4])
-
-    @property
-    def piece_values(self) -> dict[int, float]:
-        """Map chess.PAWN..chess.QUEEN → material value."""
-        import chess
-        return {
-            chess.PAWN: self.pawn_value,
-            chess.KNIGHT: self.knight_value,
-            chess.BISHOP: self.bishop_value,
-            chess.ROOK: self.rook_value,
-            chess.QUEEN: self.queen_value,
-        }
+        return self._w[4]
 
     # ---- category weights (indices 5-9) ----
     @property
     def w_material(self) -> float:
-        return float(self.genes[5])
+        return self._w[5]
 
     @property
     def w_mobility(self) -> float:
-        return float(self.genes[6])
+        return self._w[6]
 
     @property
     def w_center(self) -> float:
-        return float(self.genes[7])
+        return self._w[7]
 
     @property
     def w_king_safety(self) -> float:
-        return float(self.genes[8])
+        return self._w[8]
 
     @property
     def w_pawn_structure(self) -> float:
-        return float(self.genes[9])
+        return self._w[9]
 
     # ---- serialization ----
     def to_vector(self) -> list[float]:
@@ -110,11 +151,17 @@ class Genome:
         return self.genes.tolist()
 
     @classmethod
-    def from_vector(cls, vec: list[float], fitness: float = 0.0) -> Genome:
-        """Create a Genome from a plain list of floats."""
-        if len(vec) != NUM_GENES:
-            raise ValueError(f"Expected {NUM_GENES} genes, got {len(vec)}")
-        return cls(genes=np.array(vec, dtype=np.float64), fitness=fitness)
+    def from_vector(cls, vec: Iterable[float] | np.ndarray, fitness: float = 0.0, copy: bool = False) -> Genome:
+        """Create a Genome from a list or array of floats.
+
+        A :data:`GENE_DTYPE` array of the right shape is wrapped as-is (the
+        genome then shares it); pass ``copy=True`` to detach from the
+        caller's array.
+        """
+        genes = np.asarray(vec, dtype=GENE_DTYPE)
+        if genes.shape != (NUM_GENES,):
+            raise ValueError(f"Expected {NUM_GENES} genes, got shape {genes.shape}")
+        return cls(genes=genes.copy() if copy else genes, fitness=fitness)
 
     def to_dict(self) -> dict:
         """Serialize to a JSON-compatible dict."""
@@ -135,3 +182,54 @@ class Genome:
     def __repr__(self) -> str:
         gene_str = ", ".join(f"{l}={v:.3f}" for l, v in zip(GENE_LABELS, self.genes))
         return f"Genome({gene_str}, fitness={self.fitness:.2f})"
+
+
+class Population:
+    """Structure-of-arrays population: an (n, NUM_GENES) gene matrix ``G``
+    and a length-n fitness vector ``fit``.
+
+    Indexing or iterating yields :class:`Genome` proxies onto the rows.
+    Proxies cache their weights when created, so ``G`` must not be edited
+    once genomes are handed out; build a new population instead.
+    """
+
+    __slots__ = ("G", "fit")
+
+    def __init__(self, G: np.ndarray, fit: np.ndarray | None = None) -> None:
+        self.G = G
+        self.fit = np.zeros(len(G), dtype=np.float64) if fit is None else fit
+
+    @classmethod
+    def from_genomes(cls, genomes: Iterable[Genome]) -> Population:
+        """Pack genomes into a population, reusing their storage when possible.
+
+        A list that is exactly ``pop.genomes()`` (same population, rows in
+        order) returns ``pop`` itself; anything else is copied into new arrays.
+        """
+        genomes = list(genomes)
+        if genomes:
+            pop = genomes[0]._pop
+            if len(pop) == len(genomes) and all(
+                g._pop is pop and g._idx == i for i, g in enumerate(genomes)
+            ):
+                return pop
+            G = np.stack([g.genes for g in genomes])
+        else:
+            G = np.empty((0, NUM_GENES), dtype=GENE_DTYPE)
+        fit = np.fromiter((g.fitness for g in genomes), dtype=np.float64, count=len(genomes))
+        return cls(G, fit)
+
+    def __len__(self) -> int:
+        return len(self.G)
+
+    def __getitem__(self, idx: int) -> Genome:
+        if not isinstance(idx, (int, np.integer)):
+            raise TypeError(f"Population indices must be integers, not {type(idx).__name__}")
+        return Genome._view(self, range(len(self.G))[idx])
+
+    def __iter__(self) -> Iterator[Genome]:
+        return (Genome._view(self, i) for i in range(len(self.G)))
+
+    def genomes(self) -> list[Genome]:
+        """All rows as a list of :class:`Genome` proxies."""
+        return list(self)
@@ -2,15 +2,55 @@
 
 from __future__ import annotations
 
+import copy
 import math
-from concurrent.futures import ProcessPoolExecutor
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import combinations
 from typing import Callable
 
 import chess
+import numpy as np
 
 from chessbot.engine import search
 from chessbot.evaluation import evaluate
-from chessbot.genome import Genome
+from chessbot.genome import GENE_DTYPE, Genome, Population
+from chessbot.transposition import TranspositionTable
+from chessbot.zobrist import HashedBoard
+
+
+# Finished games keyed by (white genes, black genes, depth, max_moves, snapshots).
+# Search is deterministic, so a pair of unchanged genomes (e.g. surviving
+# elites) replays the same game; FIFO-bounded like the evaluation cache.
+GAME_CACHE_SIZE = 10_000
+_GAME_CACHE: OrderedDict[tuple, dict] = OrderedDict()
+
+
+def _game_key(
+    white_genome: Genome,
+    black_genome: Genome,
+    depth: int,
+    max_moves: int,
+    record_snapshots: bool,
+) -> tuple:
+    return (white_genome.genes.tobytes(), black_genome.genes.tobytes(), depth, max_moves, record_snapshots)
+
+
+def _cache_game(key: tuple, result: dict) -> None:
+    _GAME_CACHE[key] = copy.deepcopy(result)
+    if len(_GAME_CACHE) > GAME_CACHE_SIZE:
+        _GAME_CACHE.popitem(last=False)
+
+
+def clear_game_cache() -> None:
+    """Forget all memoized game results."""
+    _GAME_CACHE.clear()
+
+
+# Board reused by every play_game call in this process (reset per game).
+# Games run one at a time per worker process, so no locking is needed.
+_BOARD = HashedBoard()
 
 
 def play_game(
@@ -18,77 +58,153 @@ def play_game(
     black_genome: Genome,
     depth: int = 2,
     max_moves: int = 100,
+    record_snapshots: bool = False,
 ) -> dict:
     """Play a game between two genomes.
 
-    A per-game transposition table is shared across all moves so that
-    positions evaluated earlier in the game can be reused.
+    Each side keeps its own transposition table for the whole game, so
+    positions searched on earlier moves are reused without mixing scores
+    from the two genomes' evaluations.
 
     Returns a dict with:
         - result: "white", "black", or "draw"
         - moves: number of moves played
-        - move_list: list of SAN move strings
-        - snapshots: list of evaluation snapshots every 10 moves
+        - move_list: list of UCI move strings (see utils.to_san_list)
+        - snapshots: evaluation snapshots every 10 moves if *record_snapshots*,
+          else an empty list (the move list is enough to recompute them)
+
+    Results are memoized per genome pair; a repeat returns a fresh copy.
     """
-    board = chess.Board()
+    key = _game_key(white_genome, black_genome, depth, max_moves, record_snapshots)
+    cached = _GAME_CACHE.get(key)
+    if cached is not None:
+        return copy.deepcopy(cached)
+
+    board = _BOARD
+    board.reset()
     snapshots: list[dict] = []
-    move_list: list[str] = []
+    # A game never exceeds max_moves plies: fill a fixed buffer, trim at the end
+    move_list: list[str | None] = [None] * max_moves
     move_count = 0
-    tt: dict = {}  # shared transposition table for the whole game
+    tables = {chess.WHITE: TranspositionTable(), chess.BLACK: TranspositionTable()}
 
-    while not board.is_game_over() and move_count < max_moves:
+    result = None
+    outcome = board.outcome(claim_draw=False)
+    while outcome is None and move_count < max_moves:
         genome = white_genome if board.turn == chess.WHITE else black_genome
-        move = search(board, genome, depth=depth, tt=tt)
+        move = search(board, genome, depth=depth, tt=tables[board.turn])
         if move is None:
+            # No legal move: a side in check is mated, otherwise stalemate
+            if board.is_check():
+                result = "black" if board.turn == chess.WHITE else "white"
+            else:
+                result = "draw"
             break
-        # Record SAN before pushing (for readable notation)
-        move_list.append(board.san(move))
+        # UCI is plain string formatting; SAN is derived on demand for display
+        move_list[move_count] = move.uci()
         board.push(move)
         move_count += 1
 
         # Snapshot every 10 moves
-        if move_count % 10 == 0:
+        if record_snapshots and move_count % 10 == 0:
             snapshots.append({
                 "move": move_count,
                 "white_eval": evaluate(board, white_genome),
                 "black_eval": evaluate(board, black_genome),
-                "fen": board.fen(),
+                "ply": move_count,  # utils.reconstruct_fen rebuilds the position
             })
 
-    # Determine result
-    if board.is_checkmate():
-        # The side whose turn it is got checkmated
-        result = "black" if board.turn == chess.WHITE else "white"
-    elif board.is_game_over() or move_count >= max_moves:
-        result = "draw"
-    else:
-        result = "draw"
+        outcome = board.outcome(claim_draw=False)
+
+    # Determine result: only checkmate has a winner, everything else is a draw
+    if result is None:
+        if outcome is not None and outcome.termination == chess.Termination.CHECKMATE:
+            result = "white" if outcome.winner == chess.WHITE else "black"
+        else:
+            result = "draw"
 
-    return {
+    record = {
         "result": result,
         "moves": move_count,
-        "move_list": move_list,
+        "move_list": move_list[:move_count],
         "snapshots": snapshots,
     }
+    _cache_game(key, record)
+    return record
+
+
+# Population rebuilt once per worker process by _init_worker
+_WORKER_POPULATION: list[Genome] = []
+
+
+def _init_worker(genes: np.ndarray | tuple[str, tuple[int, int], int]) -> None:
+    """Worker initializer: receive the population's genes once, as an (N, 10) array.
+
+    A memory-mapped population arrives as ``(path, shape, offset)`` instead
+    and is mapped read-only, so the gene matrix is never pickled.
+
+    Engine, evaluation and Zobrist tables are imported with this module, so
+    they are also set up once per worker rather than once per game.  A
+    throwaway depth-1 search then fills the lazily built lookups (castling
+    keys, move-generation paths) before the first real game starts.
+    """
+    global _WORKER_POPULATION
+    if isinstance(genes, tuple):
+        path, shape, offset = genes
+        genes = np.memmap(path, dtype=GENE_DTYPE, mode="r", shape=shape, offset=offset)
+    _WORKER_POPULATION = Population(genes).genomes()
+    if _WORKER_POPULATION:
+        search(HashedBoard(), _WORKER_POPULATION[0], depth=1, tt=TranspositionTable(size_mb=0.01))
 
 
 def _play_game_worker(args: tuple) -> tuple[int, int, dict]:
-    """Worker function for parallel game execution."""
-    i, j, white_genome, black_genome, depth, max_moves = args
-    result = play_game(white_genome, black_genome, depth=depth, max_moves=max_moves)
+    """Worker function for parallel game execution (genomes passed by index)."""
+    i, j, depth, max_moves, record_snapshots = args
+    result = play_game(
+        _WORKER_POPULATION[i], _WORKER_POPULATION[j],
+        depth=depth, max_moves=max_moves, record_snapshots=record_snapshots,
+    )
     return i, j, result
 
 
+def _make_pairs(n: int, rng: np.random.Generator | None = None) -> list[tuple[int, int]]:
+    """Tournament pairings as (i, j) with i < j, in lexicographic order.
+
+    The canonical order fixes the submission order of parallel games (and so
+    the sequence of progress callbacks); with a seeded *rng* the Swiss
+    pairings themselves are reproducible too.
+    """
+    if n <= 6:
+        # Full round-robin
+        return list(combinations(range(n), 2))
+
+    # Swiss-style: each player faces sqrt(N) random opponents, drawn for
+    # everyone at once as the k smallest of a random score matrix
+    if rng is None:
+        rng = np.random.default_rng()
+    num_opponents = min(max(2, int(math.sqrt(n))), n - 1)
+    scores = rng.random((n, n))
+    np.fill_diagonal(scores, np.inf)  # no self-play
+    opponents = np.argpartition(scores, num_opponents - 1, axis=1)[:, :num_opponents]
+    pair_arr = np.stack([np.repeat(np.arange(n), num_opponents), opponents.ravel()], axis=1)
+    # np.unique sorts the rows, which gives the lexicographic order
+    pair_arr = np.unique(np.sort(pair_arr, axis=1), axis=0)
+    return [(i, j) for i, j in pair_arr.tolist()]
+
+
 def run_tournament(
     population: list[Genome],
     depth: int = 2,
     max_moves: int = 100,
     progress_callback: Callable[[int, int], None] | None = None,
+    record_snapshots: bool = False,
+    rng: np.random.Generator | None = None,
 ) -> tuple[list[Genome], list[dict]]:
     """Run a tournament to assign fitness scores.
 
     For small populations (<=6): full round-robin.
-    For larger populations: Swiss-style pairing (sqrt(N) opponents each).
+    For larger populations: Swiss-style pairing (sqrt(N) opponents each),
+    drawn from *rng* (pass a seeded generator for reproducible pairings).
 
     Games are played in parallel across CPU cores.
 
@@ -97,74 +213,94 @@ def run_tournament(
     Returns (population, game_records) where each game_record contains:
         - white_idx, black_idx: indices in the population
         - result, moves, move_list, snapshots: from play_game()
+          (snapshots stay empty unless *record_snapshots* is set)
     """
     n = len(population)
-    # Reset fitness
-    for g in population:
-        g.fitness = 0.0
+    # Scores accumulate here by population index and are written back at the end
+    fitness_acc = np.zeros(n, dtype=np.float64)
 
-    if n <= 6:
-        # Full round-robin
-        pairs = [(i, j) for i in range(n) for j in range(i + 1, n)]
-    else:
-        # Swiss-style: each player faces sqrt(N) random opponents
-        import numpy as np
-        rng = np.random.default_rng()
-        num_opponents = max(2, int(math.sqrt(n)))
-        pairs_set: set[tuple[int, int]] = set()
-        for i in range(n):
-            opponents = rng.choice(
-                [j for j in range(n) if j != i],
-                size=min(num_opponents, n - 1),
-                replace=False,
-            )
-            for j in opponents:
-                pair = (min(i, j), max(i, j))
-                pairs_set.add(pair)
-        pairs = list(pairs_set)
+    pairs = _make_pairs(n, rng)
 
     total_games = len(pairs)
     game_records: list[dict] = []
 
-    # Build work items for parallel execution
-    work_items = [
-        (i, j, population[i], population[j], depth, max_moves)
-        for i, j in pairs
-    ]
+    # Replay memoized games first; only the rest needs playing.  Results are
+    # slotted back by pair index so scoring order is deterministic.
+    results: dict[int, tuple[int, int, dict]] = {}
+    pending: list[int] = []
+    for k, (i, j) in enumerate(pairs):
+        cached = _GAME_CACHE.get(_game_key(population[i], population[j], depth, max_moves, record_snapshots))
+        if cached is None:
+            pending.append(k)
+        else:
+            results[k] = (i, j, copy.deepcopy(cached))
+    done = len(results)
+    if done and progress_callback is not None:
+        progress_callback(done, total_games)
+
+    # Build work items for parallel execution (genomes are sent once per worker)
+    work_items = {k: (*pairs[k], depth, max_moves, record_snapshots) for k in pending}
 
     # Use parallel execution for larger workloads, sequential for small ones
-    if total_games >= 4:
-        with ProcessPoolExecutor() as executor:
-            for game_idx, (i, j, result) in enumerate(executor.map(_play_game_worker, work_items)):
-                _score_game(population, i, j, result, max_moves)
-                game_records.append({"white_idx": i, "black_idx": j, **result})
+    if len(work_items) >= 4:
+        # No point starting more processes than there are games to play
+        workers = min(os.cpu_count() or 1, len(work_items))
+        genes = Population.from_genomes(population).G
+        if isinstance(genes, np.memmap) and not isinstance(genes.base, np.ndarray):
+            # A whole mapped file (not a slice of one): workers map it
+            # themselves, so only its location is sent
+            genes.flush()
+            genes = (genes.filename, genes.shape, genes.offset)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(genes,)) as executor:
+            futures = {executor.submit(_play_game_worker, item): k for k, item in work_items.items()}
+            for future in as_completed(futures):
+                i, j, result = results[futures[future]] = future.result()
+                _cache_game(_game_key(population[i], population[j], depth, max_moves, record_snapshots), result)
+                done += 1
                 if progress_callback is not None:
-                    progress_callback(game_idx + 1, total_games)
+                    progress_callback(done, total_games)
     else:
-        for game_idx, (i, j, wg, bg, d, mm) in enumerate(work_items):
-            result = play_game(wg, bg, depth=d, max_moves=mm)
-            _score_game(population, i, j, result, max_moves)
-            game_records.append({"white_idx": i, "black_idx": j, **result})
+        for k, (i, j, d, mm, snap) in work_items.items():
+            results[k] = (i, j, play_game(population[i], population[j], depth=d, max_moves=mm, record_snapshots=snap))
+            done += 1
             if progress_callback is not None:
-                progress_callback(game_idx + 1, total_games)
+                progress_callback(done, total_games)
+
+    ordered = [results[k] for k in range(total_games)]
+    _score_games(fitness_acc, ordered, max_moves)
+    for i, j, result in ordered:
+        game_records.append({"white_idx": i, "black_idx": j, **result})
+
+    for g, fitness in zip(population, fitness_acc.tolist()):
+        g.fitness = fitness
 
     return population, game_records
 
 
-def _score_game(
-    population: list[Genome],
-    i: int,
-    j: int,
-    result: dict,
+def _score_games(
+    fitness_acc: np.ndarray,
+    games: list[tuple[int, int, dict]],
     max_moves: int,
 ) -> None:
-    """Apply scoring to population based on game result."""
-    speed_bonus = max(0, (max_moves - result["moves"]) / max_moves * 0.5)
+    """Add every game's points to *fitness_acc* (indexed by population position).
 
-    if result["result"] == "white":
-        population[i].fitness += 3.0 + speed_bonus
-    elif result["result"] == "black":
-        population[j].fitness += 3.0 + speed_bonus
-    else:
-        population[i].fitness += 1.0
-        population[j].fitness += 1.0
+    Points are scattered with one ``np.add.at`` over the interleaved
+    (white, black) indices, so each genome's total is summed in game order.
+    A game never exceeds *max_moves*, so the speed bonus needs no clamping.
+    """
+    if not games:
+        return
+    n_games = len(games)
+    players = np.fromiter((p for i, j, _ in games for p in (i, j)), dtype=np.intp, count=2 * n_games)
+    moves = np.fromiter((r["moves"] for _, _, r in games), dtype=np.float64, count=n_games)
+    outcome = np.array([r["result"] for _, _, r in games])
+
+    white_won = outcome == "white"
+    black_won = outcome == "black"
+    drawn = (~(white_won | black_won)).astype(np.float64)
+    win_points = 3.0 + (max_moves - moves) * (0.5 / max_moves)
+
+    points = np.empty((n_games, 2), dtype=np.float64)
+    points[:, 0] = np.where(white_won, win_points, drawn)
+    points[:, 1] = np.where(black_won, win_points, drawn)
+    np.add.at(fitness_acc, players, points.ravel())
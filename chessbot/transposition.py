@@ -0,0 +1,65 @@
+"""Fixed-size transposition table backed by a NumPy record array.
+
+Slots come in pairs indexed by the low bits of the Zobrist key:
+  - bucket A (even slot): depth-preferred; another position only replaces it
+    with an equal or deeper search, but a new result for the same key always does
+  - bucket B (odd slot):  always-replace, catches everything A rejects
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+TT_DTYPE = np.dtype([
+    ("key", "u8"),
+    ("depth", "i1"),
+    ("flag", "u1"),
+    ("value", "f4"),
+    ("move", "u2"),  # best move, packed as from | to << 6 | promotion << 12
+])
+
+
+class TranspositionTable:
+    """Bounded two-bucket transposition table keyed by 64-bit Zobrist hashes."""
+
+    def __init__(self, size_mb: float = 16.0):
+        n_entries = max(2, int(size_mb * (1 << 20)) // TT_DTYPE.itemsize)
+        size = 1 << (n_entries.bit_length() - 1)  # round down to a power of two
+        self.table = np.zeros(size, dtype=TT_DTYPE)
+        self._mask = (size - 1) & ~1
+        # Field views avoid building a record object on every access
+        self._keys = self.table["key"]
+        self._depths = self.table["depth"]
+        self._flags = self.table["flag"]
+        self._values = self.table["value"]
+        self._moves = self.table["move"]
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def probe(self, key: int) -> tuple[int, int, float, int] | None:
+        """Return ``(depth, flag, value, move)`` for *key*, or None on a miss.
+
+        *move* is the packed best move, 0 if none was recorded.
+        """
+        idx = key & self._mask
+        if int(self._keys[idx]) != key:
+            idx += 1
+            if int(self._keys[idx]) != key:
+                return None
+        return int(self._depths[idx]), int(self._flags[idx]), float(self._values[idx]), int(self._moves[idx])
+
+    def store(self, key: int, depth: int, flag: int, value: float, move: int = 0) -> None:
+        """Record a search result, keeping the deeper entry in bucket A."""
+        idx = key & self._mask
+        if int(self._keys[idx]) != key and depth < self._depths[idx]:
+            idx += 1
+        self._keys[idx] = key
+        self._depths[idx] = depth
+        self._flags[idx] = flag
+        self._values[idx] = value
+        self._moves[idx] = move
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self.table.fill(0)
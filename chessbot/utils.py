@@ -2,40 +2,104 @@
 
 from __future__ import annotations
 
-import json
 import time
 from pathlib import Path
 from typing import Any
 
-from chessbot.genome import Genome
+import chess
+import numpy as np
+import orjson
+
+from chessbot.genome import GENE_DTYPE, Genome, Population
+
+
+# orjson writes bytes and serializes NumPy arrays natively
+_ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2
 
 
 def save_population(population: list[Genome], path: str | Path) -> None:
-    """Save a population to a JSON file."""
+    """Save a population to a JSON file, or compressed NumPy arrays if *path* ends in ``.npz``."""
+    if str(path).endswith(".npz"):
+        pop = Population.from_genomes(population)
+        np.savez_compressed(path, genes=pop.G, fitness=pop.fit)
+        return
+    # Same layout as Genome.to_dict(), but genes stay arrays for orjson
     data = {
-        "population": [g.to_dict() for g in population],
+        "population": [{"genes": g.genes, "fitness": g.fitness} for g in population],
     }
-    with open(path, "w") as f:
-        json.dump(data, f, indent=2)
+    with open(path, "wb") as f:
+        f.write(orjson.dumps(data, option=_ORJSON_OPTIONS))
 
 
 def load_population(path: str | Path) -> list[Genome]:
-    """Load a population from a JSON file."""
-    with open(path) as f:
-        data = json.load(f)
+    """Load a population saved by :func:`save_population` (JSON or ``.npz``)."""
+    if str(path).endswith(".npz"):
+        with np.load(path) as data:
+            return Population(data["genes"].astype(GENE_DTYPE, copy=False), data["fitness"]).genomes()
+    with open(path, "rb") as f:
+        data = orjson.loads(f.read())
     return [Genome.from_dict(d) for d in data["population"]]
 
 
 def save_evolution_history(history: list[dict], path: str | Path) -> None:
-    """Save evolution history (per-generation stats) to JSON."""
-    with open(path, "w") as f:
-        json.dump(history, f, indent=2)
+    """Save evolution history (per-generation stats) as NDJSON, one line per entry."""
+    with open(path, "wb") as f:
+        for entry in history:
+            f.write(orjson.dumps(entry, option=orjson.OPT_SERIALIZE_NUMPY) + b"\n")
+
+
+def append_history_entry(entry: dict, path: str | Path) -> None:
+    """Append one generation's stats to an NDJSON history file."""
+    with open(path, "ab") as f:
+        f.write(orjson.dumps(entry, option=orjson.OPT_SERIALIZE_NUMPY) + b"\n")
 
 
 def load_evolution_history(path: str | Path) -> list[dict]:
-    """Load evolution history from JSON."""
-    with open(path) as f:
-        return json.load(f)
+    """Load evolution history from NDJSON (or a legacy JSON array)."""
+    data = Path(path).read_bytes()
+    if data.lstrip().startswith(b"["):
+        return orjson.loads(data)
+    return [orjson.loads(line) for line in data.splitlines() if line]
+
+
+def write_game_records(records: list[dict], path: str | Path) -> list[int]:
+    """Write game records as JSON lines, replacing *path*.
+
+    Returns the byte offset of every record so single games can be read
+    back with :func:`read_game_record` without loading the whole file.
+    """
+    offsets = []
+    with open(path, "wb") as f:
+        for record in records:
+            offsets.append(f.tell())
+            f.write(orjson.dumps(record, option=orjson.OPT_SERIALIZE_NUMPY) + b"\n")
+    return offsets
+
+
+def read_game_record(path: str | Path, offset: int) -> dict:
+    """Read the game record starting at byte *offset* of a JSON-lines file."""
+    with open(path, "rb") as f:
+        f.seek(offset)
+        return orjson.loads(f.readline())
+
+
+def to_san_list(uci_list: list[str], start_fen: str = chess.STARTING_FEN) -> list[str]:
+    """Convert a game's UCI move list to SAN, replaying it from *start_fen*."""
+    board = chess.Board(start_fen)
+    san_list = []
+    for uci in uci_list:
+        move = chess.Move.from_uci(uci)
+        san_list.append(board.san(move))
+        board.push(move)
+    return san_list
+
+
+def reconstruct_fen(uci_list: list[str], ply: int, start_fen: str = chess.STARTING_FEN) -> str:
+    """FEN of the position after the first *ply* moves of a game."""
+    board = chess.Board(start_fen)
+    for uci in uci_list[:ply]:
+        board.push(chess.Move.from_uci(uci))
+    return board.fen()
 
 
 class Timer:
@@ -46,8 +110,8 @@ class Timer:
         self.elapsed: float = 0.0
 
     def __enter__(self) -> Timer:
-        self._start = time.perf_counter()
+        self._start_ns = time.monotonic_ns()
         return self
 
     def __exit__(self, *args: Any) -> None:
-        self.elapsed = time.perf_counter() - self._start
+        self.elapsed = (time.monotonic_ns() - self._start_ns) * 1e-9
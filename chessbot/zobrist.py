@@ -0,0 +1,159 @@
+"""Zobrist hashing for fast, incrementally-updated position keys.
+
+A position hash is the XOR of random 64-bit keys for:
+  - every (piece, square) pair on the board
+  - the 4-bit castling-rights mask
+  - the en passant file (when an en passant square is set)
+  - the side to move (when black is to move)
+"""
+
+from __future__ import annotations
+
+import chess
+import numpy as np
+
+ZOBRIST_SEED = 0x5EED_C4E5
+
+_rng = np.random.default_rng(ZOBRIST_SEED)
+_U64_MAX = np.iinfo(np.uint64).max
+
+# Random key tables.  Piece index = piece_type - 1 (+6 for black).
+piece_keys: np.ndarray = _rng.integers(0, _U64_MAX, size=(12, 64), dtype=np.uint64, endpoint=True)
+castling_keys: np.ndarray = _rng.integers(0, _U64_MAX, size=16, dtype=np.uint64, endpoint=True)
+ep_file_keys: np.ndarray = _rng.integers(0, _U64_MAX, size=8, dtype=np.uint64, endpoint=True)
+side_key: int = int(_rng.integers(0, _U64_MAX, dtype=np.uint64, endpoint=True))
+
+# Plain Python ints for the hot path (XOR on NumPy scalars is much slower)
+_PIECE_KEYS: list[list[int]] = piece_keys.tolist()
+_CASTLING_KEYS: list[int] = castling_keys.tolist()
+_EP_FILE_KEYS: list[int] = ep_file_keys.tolist()
+
+# Squares touched by castling (king + rook), per color
+_BACK_RANK = {chess.WHITE: list(range(0, 8)), chess.BLACK: list(range(56, 64))}
+
+
+def _castling_index(castling_rights: int) -> int:
+    """Compress standard castling rights (rook squares) into a 4-bit index."""
+    return (
+        (castling_rights >> chess.H1 & 1)
+        | (castling_rights >> chess.A1 & 1) << 1
+        | (castling_rights >> chess.H8 & 1) << 2
+        | (castling_rights >> chess.A8 & 1) << 3
+    )
+
+
+def _square_key(board: chess.BaseBoard, square: int) -> int:
+    """Key of the piece on *square*, or 0 if the square is empty."""
+    piece_type = board.piece_type_at(square)
+    if piece_type is None:
+        return 0
+    offset = 0 if board.occupied_co[chess.WHITE] & chess.BB_SQUARES[square] else 6
+    return _PIECE_KEYS[piece_type - 1 + offset][square]
+
+
+# Castling key per raw castling-rights bitboard, filled on first use
+_CASTLING_BY_RIGHTS: dict[int, int] = {}
+
+
+def _state_key(board: chess.Board) -> int:
+    """Key of the non-piece state: castling rights and en passant file."""
+    rights = board.castling_rights
+    key = _CASTLING_BY_RIGHTS.get(rights)
+    if key is None:
+        key = _CASTLING_BY_RIGHTS[rights] = _CASTLING_KEYS[_castling_index(rights)]
+    ep_square = board.ep_square
+    if ep_square is not None:
+        key ^= _EP_FILE_KEYS[ep_square & 7]
+    return key
+
+
+def zobrist_hash(board: chess.Board) -> int:
+    """Compute the Zobrist hash of *board* from scratch."""
+    key = _state_key(board)
+    for square in chess.scan_forward(board.occupied):
+        key ^= _square_key(board, square)
+    if board.turn == chess.BLACK:
+        key ^= side_key
+    return key
+
+
+class HashedBoard(chess.Board):
+    """A ``chess.Board`` that keeps its Zobrist hash up to date.
+
+    ``push``/``pop`` update :attr:`zobrist` incrementally; any operation that
+    resets the move stack (``set_fen``, ``reset``, ``set_piece_at``, …)
+    recomputes it.  Direct writes to attributes such as ``turn`` or
+    ``ep_square`` are not tracked -- call :meth:`rehash` afterwards.
+    """
+
+    zobrist: int
+    _zobrist_stack: list[int]
+
+    @classmethod
+    def from_board(cls, board: chess.Board) -> HashedBoard:
+        """Create a hashed copy of *board*, including its move stack."""
+        hashed = cls(board.fen(en_passant="fen"), chess960=board.chess960)
+        hashed.move_stack = list(board.move_stack)
+        hashed._stack = board._stack[:]
+        return hashed
+
+    def rehash(self) -> None:
+        """Recompute the hash from scratch."""
+        self.zobrist = zobrist_hash(self)
+
+    def clear_stack(self) -> None:
+        super().clear_stack()
+        self._zobrist_stack = []
+        self.rehash()
+
+    def push(self, move: chess.Move) -> None:
+        key = self.zobrist
+        self._zobrist_stack.append(key)
+        key ^= _state_key(self)
+
+        if move:
+            # Squares whose contents may change with this move
+            if self.is_castling(move):
+                squares = _BACK_RANK[self.turn]
+            elif self.is_en_passant(move):
+                squares = [move.from_square, move.to_square, move.to_square + (-8 if self.turn == chess.WHITE else 8)]
+            else:
+                squares = [move.from_square, move.to_square]
+
+            for square in squares:
+                key ^= _square_key(self, square)
+            super().push(move)
+            for square in squares:
+                key ^= _square_key(self, square)
+        else:
+            super().push(move)
+
+        self.zobrist = key ^ _state_key(self) ^ side_key
+
+    def pop(self) -> chess.Move:
+        move = super().pop()
+        if self._zobrist_stack:
+            self.zobrist = self._zobrist_stack.pop()
+        else:
+            self.rehash()
+        return move
+
+    def copy(self, *, stack: bool | int = True) -> HashedBoard:
+        board = super().copy(stack=stack)
+        board.zobrist = self.zobrist
+        n = len(board.move_stack)
+        board._zobrist_stack = self._zobrist_stack[-n:] if n else []
+        return board
+
+    def root(self) -> HashedBoard:
+        board = super().root()
+        board.rehash()
+        return board
+
+    def apply_transform(self, f) -> None:
+        super().apply_transform(f)
+        self.rehash()
+
+    def apply_mirror(self) -> None:
+        super().apply_mirror()
+        self.rehash()
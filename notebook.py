@@ -6,6 +6,8 @@ app = marimo.App(width="medium")
 
 @app.cell
 def imports():
+    from pathlib import Path
+
     import marimo as mo
     import numpy as np
     import chess
@@ -17,11 +19,12 @@ def imports():
     from chessbot.engine import search
     from chessbot.genetic import initialize_population, next_generation
     from chessbot.tournament import run_tournament
-    from chessbot.utils import Timer
+    from chessbot.utils import Timer, read_game_record, write_game_records
 
     return (
         GENE_LABELS,
         Genome,
+        Path,
         Timer,
         chess,
         go,
@@ -29,7 +32,9 @@ def imports():
         mo,
         next_generation,
         np,
+        read_game_record,
         run_tournament,
+        write_game_records,
     )
 
 
@@ -102,6 +107,7 @@ def run_button(mo):
 @app.cell
 def evolution(
     Genome,
+    Path,
     Timer,
     initialize_population,
     mo,
@@ -110,18 +116,26 @@ def evolution(
     params_form,
     run_btn,
     run_tournament,
+    write_game_records,
 ):
     mo.stop(not run_btn.value)
     mo.stop(params_form.value is None, mo.md("**Set parameters first.**"))
 
     p = params_form.value
-    rng = np.random.default_rng(int(p["seed"]))
+    # Independent child streams per consumer: drawing pairings can never
+    # shift the breeding sequence, and one seed still reproduces the run
+    init_rng, pairing_rng, breeding_rng = np.random.default_rng(int(p["seed"])).spawn(3)
 
-    pop = initialize_population(int(p["pop_size"]), rng=rng)
+    pop = initialize_population(int(p["pop_size"]), rng=init_rng)
 
     history = []
     best_per_gen = []
-    all_games = {}  # gen_index -> list of game records
+    # Full game records are streamed to one JSONL file per generation; only
+    # a small summary (with the record's byte offset) stays in memory.
+    games_dir = Path(".cache")
+    games_dir.mkdir(exist_ok=True)
+    game_paths = {}  # gen_index -> JSONL path
+    game_index = {}  # gen_index -> list of game summaries
 
     with mo.status.progress_bar(
         total=int(p["generations"]),
@@ -131,20 +145,33 @@ def evolution(
         for gen in range(int(p["generations"])):
             with Timer(f"Gen {gen}") as t:
                 pop, game_records = run_tournament(
-                    pop, depth=int(p["depth"]), max_moves=60,
+                    pop, depth=int(p["depth"]), max_moves=60, rng=pairing_rng,
                 )
 
-            all_games[gen] = game_records
-
-            fitnesses = [g.fitness for g in pop]
-            best = max(pop, key=lambda g: g.fitness)
+            _path = games_dir / f"gen{gen}.jsonl"
+            _offsets = write_game_records(game_records, _path)
+            game_paths[gen] = _path
+            game_index[gen] = [
+                {
+                    "white_idx": _r["white_idx"],
+                    "black_idx": _r["black_idx"],
+                    "result": _r["result"],
+                    "moves": _r["moves"],
+                    "offset": _offset,
+                }
+                for _r, _offset in zip(game_records, _offsets)
+            ]
+
+            fit = np.fromiter((g.fitness for g in pop), dtype=np.float64, count=len(pop))
+            best_idx = int(fit.argmax())
+            best = pop[best_idx]
             best_per_gen.append(best.copy())
 
             history.append({
                 "generation": gen,
-                "best_fitness": max(fitnesses),
-                "avg_fitness": float(np.mean(fitnesses)),
-                "worst_fitness": min(fitnesses),
+                "best_fitness": float(fit[best_idx]),
+                "avg_fitness": float(fit.mean()),
+                "worst_fitness": float(fit.min()),
                 "best_genes": best.to_vector(),
                 "elapsed": t.elapsed,
             })
@@ -154,7 +181,7 @@ def evolution(
                 elite_fraction=float(p["elite_pct"]),
                 mutation_rate=float(p["mutation_rate"]),
                 mutation_magnitude=float(p["mutation_mag"]),
-                rng=rng,
+                rng=breeding_rng,
             )
 
             bar.update()
@@ -163,10 +190,10 @@ def evolution(
 
     mo.md(
         f"Evolution finished: **{int(p['generations'])}** generations, "
-        f"**{sum(len(g) for g in all_games.values())}** games played, "
+        f"**{sum(len(g) for g in game_index.values())}** games played, "
         f"champion fitness = **{champion.fitness:.2f}**"
     )
-    return all_games, champion, history
+    return champion, game_index, game_paths, history
 
 
 @app.cell
@@ -249,11 +276,11 @@ def replay_header(mo):
 
 
 @app.cell
-def game_selector(all_games, mo):
-    mo.stop(not all_games, mo.md("*Run evolution to browse games.*"))
+def game_selector(game_index, mo):
+    mo.stop(not game_index, mo.md("*Run evolution to browse games.*"))
 
     # Build game options: "Gen X - Game Y: Bot A vs Bot B (result)"
-    gen_options = {f"Generation {g}": g for g in sorted(all_games.keys())}
+    gen_options = {f"Generation {g}": g for g in sorted(game_index.keys())}
     gen_dropdown = mo.ui.dropdown(
         options=gen_options,
         value="Generation 0",
@@ -264,10 +291,10 @@ def game_selector(all_games, mo):
 
 
 @app.cell
-def game_picker(all_games, gen_dropdown, mo):
+def game_picker(game_index, gen_dropdown, mo):
     mo.stop(gen_dropdown.value is None)
     _gen = gen_dropdown.value
-    _games = all_games[_gen]
+    _games = game_index[_gen]
 
     _game_labels = {}
     for _i, _g in enumerate(_games):
@@ -285,10 +312,43 @@ def game_picker(all_games, gen_dropdown, mo):
 
 
 @app.cell
-def move_slider_cell(all_games, game_dropdown, gen_dropdown, mo):
+def selected_game(
+    game_dropdown,
+    game_index,
+    game_paths,
+    gen_dropdown,
+    mo,
+    read_game_record,
+):
     mo.stop(gen_dropdown.value is None or game_dropdown.value is None)
-    _game = all_games[gen_dropdown.value][game_dropdown.value]
-    _total_moves = _game["moves"]
+    # Load just the selected record from disk
+    _summary = game_index[gen_dropdown.value][game_dropdown.value]
+    game = read_game_record(game_paths[gen_dropdown.value], _summary["offset"])
+    return (game,)
+
+
+@app.cell
+def precompute_game(chess, game):
+    # Walk the game once per selection; slider changes then just index these.
+    # Entry k describes the position after k moves.
+    _board = chess.Board()
+    fens = [_board.fen()]
+    last_moves = [None]
+    numbered_sans = []
+    for _i, _uci in enumerate(game["move_list"]):
+        _move = chess.Move.from_uci(_uci)
+        _san = _board.san(_move)
+        _board.push(_move)
+        # Build numbered move list: "1. e4 e5 2. Nf3 ..."
+        numbered_sans.append(f"{_i // 2 + 1}. {_san}" if _i % 2 == 0 else _san)
+        fens.append(_board.fen())
+        last_moves.append(_move)
+    return fens, last_moves, numbered_sans
+
+
+@app.cell
+def move_slider_cell(game, mo):
+    _total_moves = game["moves"]
 
     move_slider = mo.ui.slider(
         start=0,
@@ -304,37 +364,23 @@ def move_slider_cell(all_games, game_dropdown, gen_dropdown, mo):
 
 @app.cell
 def board_replay(
-    all_games,
     chess,
-    game_dropdown,
-    gen_dropdown,
+    fens,
+    game,
+    last_moves,
     mo,
     move_slider,
+    numbered_sans,
 ):
-    mo.stop(
-        gen_dropdown.value is None
-        or game_dropdown.value is None
-        or move_slider.value is None
-    )
-
-    _game = all_games[gen_dropdown.value][game_dropdown.value]
-    _move_list = _game["move_list"]
-    _target_move = move_slider.value
+    mo.stop(move_slider.value is None)
 
-    # Rebuild the board up to the selected move
-    _board = chess.Board()
-    _san_log = []
-    for _i, _san in enumerate(_move_list[:_target_move]):
-        _move = _board.parse_san(_san)
-        _board.push(_move)
-        # Build numbered move list: "1. e4 e5 2. Nf3 ..."
-        if _i % 2 == 0:
-            _san_log.append(f"{_i // 2 + 1}. {_san}")
-        else:
-            _san_log.append(_san)
+    _game = game
+    _target_move = min(move_slider.value, _game["moves"])
 
-    # Highlight the last move played
-    _last_move = _board.peek() if _board.move_stack else None
+    # Position and last move (for highlighting) come precomputed per ply
+    _board = chess.Board(fens[_target_move])
+    _last_move = last_moves[_target_move]
+    _san_log = numbered_sans[:_target_move]
     _svg = chess.svg.board(_board, lastmove=_last_move, size=420)
 
     # Status line
@@ -3,8 +3,12 @@
 import chess
 import pytest
 
-from chessbot.engine import _order_moves, search
+import numpy as np
+
+from chessbot.engine import _EXACT, _order_moves, _pack_move, _quiesce, search
 from chessbot.genome import Genome
+from chessbot.transposition import TranspositionTable
+from chessbot.zobrist import HashedBoard
 
 
 @pytest.fixture
@@ -22,10 +26,8 @@ def test_search_returns_legal_move(genome):
 def test_search_game_over(genome):
     # Fool's mate
     board = chess.Board()
-    board.push_san("f3")
-    board.push_san("e5")
-    board.push_san("g4")
-    board.push_san("Qh4#")
+    for uci in ("f2f3", "e7e5", "g2g4", "d8h4"):
+        board.push(chess.Move.from_uci(uci))
     assert board.is_checkmate()
     move = search(board, genome, depth=2)
     assert move is None
@@ -46,6 +48,21 @@ def test_search_captures_hanging_queen(genome):
     assert move in board.legal_moves
 
 
+def test_quiescence_sees_recapture(genome):
+    # Qxd5 wins a pawn at depth 1 but loses the queen to ...cxd5
+    board = chess.Board("k7/8/2p5/3p4/8/8/8/K2Q4 w - - 0 1")
+    move = search(board, genome, depth=1)
+    assert move != chess.Move.from_uci("d1d5")
+
+
+def test_quiescence_keeps_main_search_entry(genome):
+    board = HashedBoard("k7/8/2p5/3p4/8/8/8/K2Q4 w - - 0 1")
+    tt = TranspositionTable(size_mb=0.01)
+    tt.store(board.zobrist, 3, _EXACT, 1.5, 77)
+    _quiesce(board, genome, -1e9, 1e9, True, tt)
+    assert tt.probe(board.zobrist) == (3, _EXACT, 1.5, 77)
+
+
 def test_move_ordering():
     board = chess.Board()
     board.push_san("e4")
@@ -57,13 +74,33 @@ def test_move_ordering():
     assert moves[0] == capture
 
 
+def test_move_ordering_mvv_lva():
+    # White pawn on e4 can take the queen on d5, white queen on h5 can take
+    # the pawn on h7: the queen capture comes first, then the pawn capture.
+    board = chess.Board("k7/7p/8/3q3Q/4P3/8/8/4K3 w - - 0 1")
+    moves = _order_moves(board)
+    assert moves[0] == chess.Move.from_uci("e4d5")
+    assert moves[1] == chess.Move.from_uci("h5d5")
+    assert moves[2] == chess.Move.from_uci("h5h7")
+
+
+def test_move_ordering_killers_and_history():
+    board = chess.Board()
+    killer = chess.Move.from_uci("b1c3")
+    killers = np.array([_pack_move(killer), 0], dtype=np.int32)
+    history = np.zeros((64, 64), dtype=np.int32)
+    history[chess.G1, chess.F3] = 5
+    moves = _order_moves(board, killers, history)
+    assert moves[0] == killer
+    assert moves[1] == chess.Move.from_uci("g1f3")
+
+
 def test_search_avoids_checkmate(genome):
     # Position where white must block checkmate
     # Black threatens Qh4# after f3 e5 g4
     board = chess.Board()
-    board.push_san("f3")
-    board.push_san("e5")
-    board.push_san("g4")
+    for uci in ("f2f3", "e7e5", "g2g4"):
+        board.push(chess.Move.from_uci(uci))
     # Now black to move, should play Qh4#
     move = search(board, genome, depth=2)
     assert move is not None
@@ -3,7 +3,9 @@
 import chess
 import pytest
 
+from chessbot import evaluation
 from chessbot.evaluation import (
+    clear_eval_cache,
     eval_center_control,
     eval_king_safety,
     eval_material,
@@ -12,6 +14,7 @@ from chessbot.evaluation import (
     evaluate,
 )
 from chessbot.genome import Genome
+from chessbot.zobrist import HashedBoard
 
 
 @pytest.fixture
@@ -37,10 +40,26 @@ def test_material_white_advantage(genome):
 def test_mobility_starting_position():
     board = chess.Board()
     mob = eval_mobility(board)
-    # White to move in starting position: both sides have 20 legal moves
+    # Symmetric position: both sides attack the same number of squares
     assert mob == 0.0
 
 
+def test_mobility_pinned_piece_restricted():
+    # The e2 knight is pinned by the e8 rook and adds nothing to white's king's 4;
+    # black has 12 rook squares (up to e2) and 3 king squares
+    board = chess.Board("4r2k/8/8/8/8/8/4N3/4K3 w - - 0 1")
+    assert eval_mobility(board) == 4 - 15
+
+
+def test_mobility_pin_independent_of_side_to_move():
+    # Same position with black to move: the white knight is still pinned
+    board = chess.Board("4r2k/8/8/8/8/8/4N3/4K3 b - - 0 1")
+    assert eval_mobility(board) == 4 - 15
+    # And a black piece pinned while white is on move
+    board = chess.Board("4k3/4n3/8/8/8/8/8/4R2K w - - 0 1")
+    assert eval_mobility(board) == 15 - 4
+
+
 def test_center_control_starting_position():
     board = chess.Board()
     score = eval_center_control(board)
@@ -54,10 +73,8 @@ def test_evaluate_checkmate():
     board = chess.Board("rnb1kbnr/pppp1ppp/8/4p3/6Pq/5P2/PPPPP2P/RNBQKBNR w KQkq - 1 3")
     # Actually set up fool's mate: white is checkmated
     board = chess.Board()
-    board.push_san("f3")
-    board.push_san("e5")
-    board.push_san("g4")
-    board.push_san("Qh4#")
+    for uci in ("f2f3", "e7e5", "g2g4", "d8h4"):
+        board.push(chess.Move.from_uci(uci))
     assert board.is_checkmate()
     score = evaluate(board, genome)
     # White is checkmated (it's white's turn and checkmate) → large negative
@@ -93,3 +110,46 @@ def test_king_safety_starting(genome):
     score = eval_king_safety(board)
     # Both kings have same shelter in starting position
     assert isinstance(score, float)
+
+
+def test_pawn_structure_doubled_isolated_passed():
+    # Two white e-pawns, no black pawns: doubled (-0.4), isolated (-0.3),
+    # passed on ranks 2 and 3 (+0.1 + 0.2)
+    board = chess.Board("4k3/8/8/8/8/4P3/4P3/4K3 w - - 0 1")
+    assert abs(eval_pawn_structure(board) - (-0.4)) < 1e-9
+    # Mirrored for black gives the opposite sign
+    assert abs(eval_pawn_structure(board.mirror()) - 0.4) < 1e-9
+
+
+def test_king_safety_shelter_and_proximity():
+    # White king sheltered by f2/g2/h2, black king bare with a white knight nearby
+    board = chess.Board("6k1/8/5N2/8/8/8/5PPP/6K1 w - - 0 1")
+    assert abs(eval_king_safety(board) - (3 * 0.3 + 0.2)) < 1e-9
+
+
+def test_evaluate_cache_hashed_board(genome):
+    clear_eval_cache()
+    board = HashedBoard()
+    board.push_san("e4")
+    first = evaluate(board, genome)
+    assert len(evaluation._eval_cache) == 1
+    assert evaluate(board, genome) == first
+    assert len(evaluation._eval_cache) == 1
+    # Entries are keyed by weights: an equal genome shares them, a different one does not
+    evaluate(board, genome.copy())
+    assert len(evaluation._eval_cache) == 1
+    other = genome.to_vector()
+    other[6] += 0.5
+    evaluate(board, Genome.from_vector(other))
+    assert len(evaluation._eval_cache) == 2
+    clear_eval_cache()
+    assert len(evaluation._eval_cache) == 0
+
+
+def test_evaluate_has_moves_fast_path(genome):
+    mated = chess.Board("rnb1kbnr/pppp1ppp/8/4p3/6Pq/5P2/PPPPP2P/RNBQKBNR w KQkq - 1 3")
+    assert evaluate(mated, genome, has_moves=False) == -10000.0
+    stalemate = chess.Board("k7/2Q5/1K6/8/8/8/8/8 b - - 0 1")
+    assert stalemate.is_stalemate()
+    assert evaluate(stalemate, genome, has_moves=False) == 0.0
+    assert evaluate(chess.Board("8/8/4k3/8/8/3KB3/8/8 w - - 0 1"), genome, has_moves=True) == 0.0
@@ -1,9 +1,11 @@
 """Tests for genome.py."""
 
+import pickle
+
 import numpy as np
 import pytest
 
-from chessbot.genome import DEFAULT_GENES, NUM_GENES, Genome
+from chessbot.genome import DEFAULT_GENES, GENE_DTYPE, NUM_GENES, Genome, Population
 
 
 def test_default_genome():
@@ -33,19 +35,40 @@ def test_round_trip_dict():
 def test_from_vector_wrong_length():
     with pytest.raises(ValueError):
         Genome.from_vector([1.0, 2.0])
+    with pytest.raises(ValueError):
+        Genome.from_vector(np.ones((2, 10)))
+
+
+def test_from_vector_array_shared_unless_copied():
+    vec = np.linspace(0.5, 5.0, 10, dtype=GENE_DTYPE)
+    assert np.shares_memory(Genome.from_vector(vec).genes, vec)
+    assert not np.shares_memory(Genome.from_vector(vec, copy=True).genes, vec)
 
 
 def test_piece_values():
     g = Genome()
     pv = g.piece_values
     assert pv[1] == g.pawn_value  # chess.PAWN == 1
+    assert pv[5] == g.queen_value
+    assert g.piece_values is pv  # built once, not per access
+
+
+def test_genes_stored_as_float32():
+    assert Genome().genes.dtype == GENE_DTYPE
+    assert Genome.from_vector(list(DEFAULT_GENES)).genes.dtype == GENE_DTYPE
 
 
 def test_copy_independence():
     g = Genome()
     g2 = g.copy()
-    g2.genes[0] = 999.0
-    assert g.genes[0] != 999.0
+    assert not np.shares_memory(g.genes, g2.genes)
+
+
+def test_genes_read_only():
+    g = Genome()
+    with pytest.raises(ValueError):
+        g.genes[0] = 999.0
+    assert g.pawn_value == g.genes[0] == g.piece_values[1]
 
 
 def test_properties():
@@ -56,7 +79,40 @@ def test_properties():
     assert g.rook_value == 5.0
     assert g.queen_value == 9.0
     assert g.w_material == 1.0
-    assert g.w_mobility == 0.1
-    assert g.w_center == 0.3
-    assert g.w_king_safety == 0.2
-    assert g.w_pawn_structure == 0.2
+    # Genes are float32, so weights without an exact binary form are approximate
+    assert g.w_mobility == pytest.approx(0.1)
+    assert g.w_center == pytest.approx(0.3)
+    assert g.w_king_safety == pytest.approx(0.2)
+    assert g.w_pawn_structure == pytest.approx(0.2)
+
+
+def test_population_rows_are_genome_views():
+    pop = Population(np.tile(np.array(DEFAULT_GENES), (3, 1)))
+    genomes = pop.genomes()
+    genomes[1].fitness = 4.0
+    assert pop.fit[1] == 4.0
+    pop.fit[2] = 7.0
+    assert genomes[2].fitness == 7.0
+    assert np.shares_memory(genomes[0].genes, pop.G)
+    assert pop[-1].fitness == 7.0
+    # The same rows in order pack back into the same population
+    assert Population.from_genomes(genomes) is pop
+    reordered = Population.from_genomes(genomes[::-1])
+    assert reordered is not pop
+    np.testing.assert_array_equal(reordered.fit, [7.0, 4.0, 0.0])
+
+
+def test_population_rejects_slices():
+    pop = Population(np.tile(np.array(DEFAULT_GENES, dtype=GENE_DTYPE), (3, 1)))
+    assert pop[-1]._idx == 2
+    assert pop[np.int64(1)]._idx == 1
+    with pytest.raises(TypeError):
+        pop[0:2]
+
+
+def test_genome_pickles_standalone():
+    pop = Population(np.tile(np.array(DEFAULT_GENES), (3, 1)), np.array([1.0, 2.0, 3.0]))
+    g = pickle.loads(pickle.dumps(pop[1]))
+    assert g.fitness == 2.0
+    assert len(g._pop) == 1
+    np.testing.assert_array_almost_equal(g.genes, DEFAULT_GENES)
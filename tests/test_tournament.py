@@ -3,16 +3,25 @@
 import tempfile
 from pathlib import Path
 
+import chess
 import numpy as np
 import pytest
 
 from chessbot.genetic import initialize_population
 from chessbot.genome import Genome
-from chessbot.tournament import play_game, run_tournament
+from chessbot import tournament
+from chessbot.tournament import _make_pairs, clear_game_cache, play_game, run_tournament
 from chessbot.utils import (
     Timer,
+    append_history_entry,
+    load_evolution_history,
     load_population,
+    read_game_record,
+    reconstruct_fen,
+    save_evolution_history,
     save_population,
+    to_san_list,
+    write_game_records,
 )
 
 
@@ -27,6 +36,39 @@ def test_play_game_returns_result():
     assert len(result["move_list"]) == result["moves"]
 
 
+def test_to_san_list():
+    assert to_san_list(["e2e4", "e7e5", "g1f3"]) == ["e4", "e5", "Nf3"]
+    fen = "4k3/8/8/8/8/8/8/R3K2R w KQ - 0 1"
+    assert to_san_list(["e1g1", "e8d7"], fen) == ["O-O", "Kd7"]
+
+
+def test_reconstruct_fen():
+    moves = ["e2e4", "e7e5", "g1f3"]
+    assert reconstruct_fen(moves, 0) == chess.STARTING_FEN
+    assert reconstruct_fen(moves, 2) == "rnbqkbnr/pppp1ppp/8/4p3/4P3/8/PPPP1PPP/RNBQKBNR w KQkq - 0 2"
+
+
+def test_play_game_memoized():
+    clear_game_cache()
+    g1 = Genome()
+    g2 = Genome(genes=g1.genes * 1.1)
+    first = play_game(g1, g2, depth=1, max_moves=6)
+    assert len(tournament._GAME_CACHE) == 1
+    again = play_game(Genome(genes=g1.genes.copy()), g2, depth=1, max_moves=6)
+    assert again == first
+    assert again is not first and again["move_list"] is not first["move_list"]
+    play_game(g1, g2, depth=1, max_moves=8)
+    assert len(tournament._GAME_CACHE) == 2
+    clear_game_cache()
+
+
+def test_play_game_snapshots_opt_in():
+    g1, g2 = Genome(), Genome(genes=Genome().genes * 0.9)
+    assert play_game(g1, g2, depth=1, max_moves=10)["snapshots"] == []
+    snapshots = play_game(g1, g2, depth=1, max_moves=10, record_snapshots=True)["snapshots"]
+    assert [s["ply"] for s in snapshots] == [10]
+
+
 def test_play_game_max_moves():
     g1 = Genome()
     g2 = Genome()
@@ -46,6 +88,44 @@ def test_run_tournament_assigns_fitness():
     assert "move_list" in games[0]
 
 
+def test_swiss_pairs_sorted_and_reproducible():
+    pairs = _make_pairs(12, np.random.default_rng(7))
+    assert pairs == sorted(pairs)
+    assert all(i < j for i, j in pairs)
+    assert len(set(pairs)) == len(pairs)
+    assert pairs == _make_pairs(12, np.random.default_rng(7))
+    # Everyone plays at least sqrt(N) opponents
+    counts = np.bincount(np.array(pairs).ravel(), minlength=12)
+    assert counts.min() >= 3
+
+
+def test_score_games_scatter():
+    fitness = np.zeros(3)
+    games = [
+        (0, 1, {"result": "white", "moves": 20}),
+        (1, 2, {"result": "draw", "moves": 40}),
+        (0, 2, {"result": "black", "moves": 40}),
+    ]
+    tournament._score_games(fitness, games, max_moves=40)
+    # Wins earn 3 plus 0.5 * (unused moves / max_moves); draws earn 1 each
+    np.testing.assert_allclose(fitness, [3.25, 1.0, 4.0])
+
+
+def test_init_worker_rebuilds_population():
+    genes = np.stack([g.genes for g in initialize_population(3, rng=np.random.default_rng(7))])
+    tournament._init_worker(genes)
+    assert len(tournament._WORKER_POPULATION) == 3
+    np.testing.assert_array_equal(tournament._WORKER_POPULATION[2].genes, genes[2])
+
+
+def test_init_worker_maps_population_file(tmp_path):
+    pop = initialize_population(3, rng=np.random.default_rng(7), mmap_path=tmp_path / "genes.f32")
+    G = pop[0]._pop.G
+    tournament._init_worker((G.filename, G.shape, G.offset))
+    assert isinstance(tournament._WORKER_POPULATION[0]._pop.G, np.memmap)
+    np.testing.assert_array_equal(tournament._WORKER_POPULATION[2].genes, pop[2].genes)
+
+
 def test_run_tournament_progress_callback():
     pop = initialize_population(3, rng=np.random.default_rng(42))
     calls = []
@@ -70,6 +150,45 @@ def test_save_load_population():
     Path(path).unlink()
 
 
+def test_save_load_population_npz(tmp_path):
+    pop = initialize_population(4, rng=np.random.default_rng(42))
+    pop[2].fitness = -1.5
+    path = tmp_path / "population.npz"
+    save_population(pop, path)
+    loaded = load_population(path)
+    assert len(loaded) == 4
+    np.testing.assert_array_equal(np.stack([g.genes for g in loaded]), np.stack([g.genes for g in pop]))
+    assert loaded[2].fitness == -1.5
+
+
+def test_save_load_evolution_history(tmp_path):
+    history = [{"generation": 0, "best_fitness": 3.5, "best_genes": np.linspace(0.1, 1.0, 10)}]
+    path = tmp_path / "history.json"
+    save_evolution_history(history, path)
+    loaded = load_evolution_history(path)
+    assert loaded[0]["best_fitness"] == 3.5
+    np.testing.assert_array_equal(loaded[0]["best_genes"], history[0]["best_genes"])
+
+
+def test_append_history_entry(tmp_path):
+    path = tmp_path / "history.ndjson"
+    for gen in range(3):
+        append_history_entry({"generation": gen, "best_fitness": float(gen)}, path)
+    assert [h["generation"] for h in load_evolution_history(path)] == [0, 1, 2]
+
+
+def test_game_records_jsonl(tmp_path):
+    records = [
+        {"white_idx": 0, "black_idx": 1, "result": "draw", "moves": 2, "move_list": ["e2e4", "e7e5"]},
+        {"white_idx": 1, "black_idx": 2, "result": "white", "moves": 1, "move_list": ["d2d4"]},
+    ]
+    path = tmp_path / "gen0.jsonl"
+    offsets = write_game_records(records, path)
+    assert offsets[0] == 0
+    assert read_game_record(path, offsets[1]) == records[1]
+    assert read_game_record(path, offsets[0]) == records[0]
+
+
 def test_timer():
     import time
     with Timer("test") as t:
@@ -0,0 +1,58 @@
+"""Tests for transposition.py."""
+
+from chessbot.transposition import TT_DTYPE, TranspositionTable
+
+
+def test_size_is_power_of_two_and_bounded():
+    tt = TranspositionTable(size_mb=1.0)
+    n = len(tt)
+    assert n & (n - 1) == 0
+    assert n * TT_DTYPE.itemsize <= 1 << 20
+
+
+def test_probe_miss():
+    tt = TranspositionTable(size_mb=0.01)
+    assert tt.probe(12345) is None
+
+
+def test_store_and_probe():
+    tt = TranspositionTable(size_mb=0.01)
+    key = 0xDEADBEEFCAFEF00D
+    tt.store(key, 3, 1, 1.5)
+    assert tt.probe(key) == (3, 1, 1.5, 0)
+
+
+def test_depth_preferred_bucket_kept():
+    tt = TranspositionTable(size_mb=0.01)
+    size = len(tt)
+    deep, shallow, other = 2, 2 + size, 2 + 2 * size  # same slot pair
+    tt.store(deep, 5, 0, 1.0)
+    tt.store(shallow, 1, 0, 2.0)
+    # Deep entry survives in bucket A, shallow one lands in bucket B
+    assert tt.probe(deep) == (5, 0, 1.0, 0)
+    assert tt.probe(shallow) == (1, 0, 2.0, 0)
+    # Always-replace bucket B is overwritten by the next shallow entry
+    tt.store(other, 1, 0, 3.0)
+    assert tt.probe(shallow) is None
+    assert tt.probe(other) == (1, 0, 3.0, 0)
+    assert tt.probe(deep) == (5, 0, 1.0, 0)
+
+
+def test_same_key_overwrites():
+    tt = TranspositionTable(size_mb=0.01)
+    tt.store(42, 4, 0, 1.0)
+    tt.store(42, 2, 2, -1.0)
+    assert tt.probe(42) == (2, 2, -1.0, 0)
+
+
+def test_best_move_round_trip():
+    tt = TranspositionTable(size_mb=0.01)
+    tt.store(99, 2, 0, 0.25, move=12 | 28 << 6)
+    assert tt.probe(99) == (2, 0, 0.25, 12 | 28 << 6)
+
+
+def test_clear():
+    tt = TranspositionTable(size_mb=0.01)
+    tt.store(7, 1, 0, 0.5)
+    tt.clear()
+    assert tt.probe(7) is None
@@ -0,0 +1,99 @@
+"""Tests for zobrist.py."""
+
+import random
+
+import chess
+
+from chessbot.zobrist import HashedBoard, zobrist_hash
+
+
+def _play_random(board, plies, seed):
+    rnd = random.Random(seed)
+    for _ in range(plies):
+        moves = list(board.legal_moves)
+        if not moves:
+            break
+        board.push(rnd.choice(moves))
+
+
+def test_starting_hash_matches_full_compute():
+    board = HashedBoard()
+    assert board.zobrist == zobrist_hash(board)
+
+
+def test_incremental_matches_full_compute():
+    for seed in range(20):
+        board = HashedBoard()
+        rnd = random.Random(seed)
+        for _ in range(120):
+            moves = list(board.legal_moves)
+            if not moves:
+                break
+            board.push(rnd.choice(moves))
+            assert board.zobrist == zobrist_hash(board)
+
+
+def test_pop_restores_hash():
+    board = HashedBoard()
+    hashes = [board.zobrist]
+    _play_random(board, 40, seed=1)
+    for _ in range(len(board.move_stack)):
+        before = board.zobrist
+        board.pop()
+        assert board.zobrist == zobrist_hash(board)
+        assert board.zobrist != before
+    assert board.zobrist == hashes[0]
+
+
+def test_special_moves():
+    # Castling, en passant and promotion
+    for fen, uci in [
+        ("r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1", "e1g1"),
+        ("r3k2r/8/8/8/8/8/8/R3K2R b KQkq - 0 1", "e8c8"),
+        ("4k3/8/8/3pP3/8/8/8/4K3 w - d6 0 1", "e5d6"),
+        ("4k3/1P6/8/8/8/8/8/4K3 w - - 0 1", "b7b8q"),
+        ("1n2k3/P7/8/8/8/8/8/4K3 w - - 0 1", "a7b8n"),
+    ]:
+        board = HashedBoard(fen)
+        start = board.zobrist
+        board.push(chess.Move.from_uci(uci))
+        assert board.zobrist == zobrist_hash(board)
+        board.pop()
+        assert board.zobrist == start
+
+
+def test_transposition_same_hash():
+    a = HashedBoard()
+    for uci in ["g1f3", "g8f6", "b1c3"]:
+        a.push(chess.Move.from_uci(uci))
+    b = HashedBoard()
+    for uci in ["b1c3", "g8f6", "g1f3"]:
+        b.push(chess.Move.from_uci(uci))
+    assert a.zobrist == b.zobrist
+
+
+def test_side_to_move_changes_hash():
+    board = HashedBoard()
+    before = board.zobrist
+    board.push(chess.Move.null())
+    assert board.zobrist != before
+    assert board.zobrist == zobrist_hash(board)
+
+
+def test_copy_and_from_board():
+    board = chess.Board()
+    _play_random(board, 15, seed=3)
+    hashed = HashedBoard.from_board(board)
+    assert hashed.zobrist == zobrist_hash(hashed)
+    assert hashed.move_stack == board.move_stack
+
+    clone = hashed.copy()
+    assert clone.zobrist == hashed.zobrist
+    clone.pop()
+    assert clone.zobrist == zobrist_hash(clone)
+
+
+def test_set_fen_rehashes():
+    board = HashedBoard()
+    board.set_fen("4k3/8/8/8/8/8/8/4K2R w K - 0 1")
+    assert board.zobrist == zobrist_hash(board)